@@ -0,0 +1,98 @@
+import argparse
+from pathlib import Path
+import sys
+
+from aoc22 import bench, runner
+
+
+def _run(args: argparse.Namespace):
+    parts = args.part or runner.PARTS
+    try:
+        for part in parts:
+            runner.load(args.day, part)
+    except ValueError as e:
+        sys.exit(str(e))
+
+    for result in runner.run(args.day, args.input.read(), parts):
+        answer = str(result.answer)
+        sep = "\n" if "\n" in answer else " "
+        print(f"day {result.day} part {result.part}:{sep}{answer}")
+        print(f"  parse  {result.parse}")
+        print(f"  solve  {result.solve}")
+
+
+def _bench(args: argparse.Namespace):
+    data_dir = args.data if args.data.is_dir() else None
+    days = args.day or bench.DAYS
+    results = bench.bench(days, data_dir, args.repeat)
+    for key, result in results.items():
+        print(f"{key:24} parse {result.parse:9.4f}s  solve {result.solve:9.4f}s")
+
+    if args.save:
+        bench.save_baseline(args.baseline, results)
+    elif args.baseline.exists():
+        baseline = {
+            key: base
+            for key, base in bench.load_baseline(args.baseline).items()
+            if int(key[:2]) in days  # only the days benchmarked this time
+        }
+        regressions = list(bench.compare(results, baseline, args.threshold, args.noise))
+        if regressions:
+            sys.exit("regressions:\n" + "\n".join(regressions))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m aoc22")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="solve a day and time each part")
+    run.add_argument("day", type=int)
+    run.add_argument(
+        "--input",
+        type=argparse.FileType("r"),
+        default=sys.stdin,
+        help="puzzle input file (default: stdin)",
+    )
+    run.add_argument("--part", choices=runner.PARTS, action="append")
+    run.set_defaults(func=_run)
+
+    bench_ = commands.add_parser(
+        "bench", help="benchmark days and compare against a baseline"
+    )
+    bench_.add_argument("--day", type=int, action="append")
+    bench_.add_argument(
+        "--data",
+        type=Path,
+        default=Path("tests/data"),
+        help="directory of test inputs (default: tests/data)",
+    )
+    bench_.add_argument("--repeat", type=int, default=3)
+    bench_.add_argument(
+        "--baseline",
+        type=Path,
+        default=Path("bench_baseline.json"),
+        help="baseline results file (default: bench_baseline.json)",
+    )
+    bench_.add_argument(
+        "--save", action="store_true", help="save the results as the baseline"
+    )
+    bench_.add_argument(
+        "--threshold",
+        type=float,
+        default=1.5,
+        help="slowdown factor over the baseline that fails (default: 1.5)",
+    )
+    bench_.add_argument(
+        "--noise",
+        type=float,
+        default=0.001,
+        help="slowdowns under this many seconds never fail (default: 0.001)",
+    )
+    bench_.set_defaults(func=_bench)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
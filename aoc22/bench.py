@@ -0,0 +1,310 @@
+"""Benchmark every day against the test data and larger generated inputs.
+
+Results are keyed by day, part and input name, and can be saved as a baseline
+JSON file that later runs are compared against.
+"""
+from dataclasses import asdict, dataclass
+import itertools as it
+import json
+from pathlib import Path
+import random
+import string
+from typing import Callable, Iterable, Optional
+
+from aoc22 import runner
+
+
+DAYS = (1, 2, 3, 4, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17)
+
+
+def _gen_day01(rng: random.Random):
+    return "\n\n".join(
+        "\n".join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15)))
+        for _ in range(20000)
+    )
+
+
+def _gen_day02(rng: random.Random):
+    return "\n".join(f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(100000))
+
+
+def _gen_day03(rng: random.Random):
+    lines = []
+    for _ in range(10000):
+        letters = list(string.ascii_letters)
+        rng.shuffle(letters)
+        badge, pools = letters[0], (letters[1:18], letters[18:35], letters[35:52])
+        for pool in pools:
+            error, left, right = pool[0], pool[1:9], pool[9:]
+            n = rng.randint(4, 20)
+            lhalf = [error, badge] + rng.choices(left, k=n - 2)
+            rhalf = [error] + rng.choices(right, k=n - 1)
+            rng.shuffle(lhalf)
+            rng.shuffle(rhalf)
+            lines.append("".join(lhalf + rhalf))
+    return "\n".join(lines)
+
+
+def _gen_day04(rng: random.Random):
+    def section():
+        start = rng.randint(1, 99)
+        return f"{start}-{rng.randint(start, 99)}"
+
+    return "\n".join(f"{section()},{section()}" for _ in range(100000))
+
+
+def _gen_day07(rng: random.Random):
+    lines = ["$ cd /"]
+    dirs = it.count()
+
+    def listing(depth: int):
+        lines.append("$ ls")
+        lines.extend(
+            f"{rng.randint(1, 300000)} f{j}.dat" for j in range(rng.randint(0, 5))
+        )
+        num_dirs = rng.randint(1, 3) if len(lines) < 40000 and depth < 30 else 0
+        subdirs = [f"d{next(dirs)}" for _ in range(num_dirs)]
+        lines.extend(f"dir {d}" for d in subdirs)
+        for d in subdirs:
+            lines.append(f"$ cd {d}")
+            listing(depth + 1)
+            lines.append("$ cd ..")
+
+    listing(0)
+    return "\n".join(lines)
+
+
+def _gen_day08(rng: random.Random):
+    return "\n".join(
+        "".join(rng.choice(string.digits) for _ in range(199)) for _ in range(199)
+    )
+
+
+def _gen_day09(rng: random.Random):
+    return "\n".join(f"{rng.choice('RULD')} {rng.randint(1, 20)}" for _ in range(20000))
+
+
+def _gen_day10(rng: random.Random):
+    lines = []
+    x = 1
+    for _ in range(20000):
+        if rng.random() < 0.3:
+            lines.append("noop")
+        else:
+            dx = rng.randint(-5, 5)
+            dx = -dx if not 0 <= x + dx <= 40 else dx
+            x += dx
+            lines.append(f"addx {dx}")
+    return "\n".join(lines)
+
+
+def _gen_day11(rng: random.Random):
+    primes = [2, 3, 5, 7, 11, 13, 17, 19]
+    rng.shuffle(primes)
+    ops = ["* 19", "+ 6", "* old", "+ 3", "* 7", "+ 8", "+ 2", "+ 4"]
+    monkeys = []
+    for i, divisor in enumerate(primes):
+        others = [j for j in range(len(primes)) if j != i]
+        true_to, false_to = rng.sample(others, 2)
+        items = ", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))
+        monkeys.append(
+            f"Monkey {i}:\n"
+            f"  Starting items: {items}\n"
+            f"  Operation: new = old {ops[i]}\n"
+            f"  Test: divisible by {divisor}\n"
+            f"    If true: throw to monkey {true_to}\n"
+            f"    If false: throw to monkey {false_to}\n"
+        )
+    return "\n".join(monkeys)
+
+
+def _gen_day12(rng: random.Random):
+    w, h = 400, 100
+    rows = []
+    for y in range(h):
+        row = []
+        for x in range(w):
+            ht = min(25, (x + y) * 26 // (w + h))
+            if rng.random() < 0.2:
+                ht = max(0, ht - rng.randint(1, 3))
+            row.append(string.ascii_lowercase[ht])
+        rows.append(row)
+    rows[0][0] = "S"
+    rows[h - 1][w - 1] = "E"
+    return "\n".join("".join(r) for r in rows)
+
+
+def _gen_day13(rng: random.Random):
+    def packet(depth=0):
+        items = []
+        for _ in range(rng.randint(0, 5)):
+            if depth < 4 and rng.random() < 0.3:
+                items.append(packet(depth + 1))
+            else:
+                items.append(str(rng.randint(0, 10)))
+        return f"[{','.join(items)}]"
+
+    def non_divider():
+        while (p := packet()) in ("[[2]]", "[[6]]"):
+            pass
+        return p
+
+    return "\n\n".join(f"{non_divider()}\n{non_divider()}" for _ in range(2000))
+
+
+def _gen_day14(rng: random.Random):
+    lines = []
+    for _ in range(150):
+        x, y = rng.randint(440, 560), rng.randint(10, 170)
+        points = [(x, y)]
+        for i in range(rng.randint(1, 5)):
+            if i % 2:
+                x += rng.randint(-8, 8)
+            else:
+                y += rng.randint(1, 4)
+            points.append((x, y))
+        lines.append(" -> ".join(f"{x},{y}" for x, y in points))
+    return "\n".join(lines)
+
+
+def _gen_day15(rng: random.Random):
+    # four big sensors diagonal from the distress beacon leave exactly it uncovered
+    from aoc22.day15 import PART_B_XY_MAX
+
+    bx, by = rng.randint(0, PART_B_XY_MAX), rng.randint(0, PART_B_XY_MAX)
+    a = 2 * PART_B_XY_MAX
+    reports = []
+    for dx, dy in ((a, a), (-a, a), (a, -a), (-a, -a)):
+        sx, sy = bx + dx, by + dy
+        reports.append((sx, sy, sx + 2 * a - 1, sy))
+    while len(reports) < 30:
+        sx, sy = rng.randint(0, PART_B_XY_MAX), rng.randint(0, PART_B_XY_MAX)
+        reach = abs(sx - bx) + abs(sy - by) - 1
+        d = rng.randint(0, reach)
+        reports.append((sx, sy, sx + d // 2, sy + d - d // 2))
+    return "\n".join(
+        f"Sensor at x={sx}, y={sy}: closest beacon is at x={x}, y={y}"
+        for sx, sy, x, y in reports
+    )
+
+
+def _gen_day16(rng: random.Random):
+    labels = ["AA"] + rng.sample(
+        [
+            "".join(p)
+            for p in it.product(string.ascii_uppercase, repeat=2)
+            if p != ("A", "A")
+        ],
+        39,
+    )
+    flows = {l: 0 for l in labels}
+    for l in rng.sample(labels[1:], 10):
+        flows[l] = rng.randint(3, 25)
+    tunnels: dict[str, set[str]] = {l: set() for l in labels}
+    for a, b in it.pairwise(labels):
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+    for _ in range(20):
+        a, b = rng.sample(labels, 2)
+        tunnels[a].add(b)
+        tunnels[b].add(a)
+    return "\n".join(
+        f"Valve {l} has flow rate={flows[l]}; tunnels lead to valves "
+        + ", ".join(sorted(tunnels[l]))
+        for l in labels
+    )
+
+
+def _gen_day17(rng: random.Random):
+    return "".join(rng.choice("<>") for _ in range(10091))
+
+
+generators: dict[int, Callable[[random.Random], str]] = {
+    1: _gen_day01,
+    2: _gen_day02,
+    3: _gen_day03,
+    4: _gen_day04,
+    7: _gen_day07,
+    8: _gen_day08,
+    9: _gen_day09,
+    10: _gen_day10,
+    11: _gen_day11,
+    12: _gen_day12,
+    13: _gen_day13,
+    14: _gen_day14,
+    15: _gen_day15,
+    16: _gen_day16,
+    17: _gen_day17,
+}
+"""Generators of larger inputs, seeded by day so they're the same every run."""
+
+
+@dataclass
+class Measurement:
+    answer: str
+    parse: float
+    solve: float
+
+    @property
+    def total(self):
+        return self.parse + self.solve
+
+
+def inputs(day: int, data_dir: Optional[Path] = None):
+    """Yield (name, data) for each input a day is benchmarked against."""
+    if data_dir is not None:
+        for path in sorted(data_dir.glob(f"day{day:02}*.txt")):
+            yield path.name, path.read_text()
+    if day in generators:
+        yield f"generated{day:02}", generators[day](random.Random(day))
+
+
+def bench(days: Iterable[int] = DAYS, data_dir: Optional[Path] = None, repeat: int = 3):
+    """Benchmark the days, keeping the fastest of repeat runs of each part."""
+    results: dict[str, Measurement] = {}
+    for day in days:
+        for name, data in inputs(day, data_dir):
+            for _ in range(repeat):
+                for result in runner.run(day, data):
+                    key = f"{day:02}{result.part}/{name}"
+                    measurement = Measurement(
+                        str(result.answer), result.parse.wall, result.solve.wall
+                    )
+                    if key not in results or measurement.total < results[key].total:
+                        results[key] = measurement
+    return results
+
+
+def compare(
+    results: dict[str, Measurement],
+    baseline: dict[str, Measurement],
+    threshold: float = 1.5,
+    noise: float = 0.001,
+):
+    """Yield a description of each result that regressed from the baseline.
+
+    A result regressed if its answer changed, or if it took more than threshold
+    times as long as the baseline and more than noise seconds longer. Baseline
+    entries with no result, such as a part or input that went missing, regress
+    too.
+    """
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        if result.answer != base.answer:
+            yield f"{key}: answer changed from {base.answer!r} to {result.answer!r}"
+        elif (
+            result.total > base.total * threshold and result.total - base.total > noise
+        ):
+            yield f"{key}: {result.total:.4f}s is {result.total / base.total:.2f}x baseline {base.total:.4f}s"
+    for key in sorted(baseline.keys() - results.keys()):
+        yield f"{key}: missing from the results"
+
+
+def load_baseline(path: Path):
+    return {k: Measurement(**v) for k, v in json.loads(path.read_text()).items()}
+
+
+def save_baseline(path: Path, results: dict[str, Measurement]):
+    path.write_text(json.dumps({k: asdict(v) for k, v in results.items()}, indent=2))
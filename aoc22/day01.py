@@ -1,12 +1,67 @@
-import itertools as it
+import heapq
 import sys
+from typing import IO
+
+
+CHUNK_SIZE = 1 << 16
+
+
+def _totals(stream: IO[str], chunk_size: int = CHUNK_SIZE):
+    """Yield the calories held by each elf, reading the stream a chunk at a time."""
+    total, held = 0, False
+    rest = ""
+    while chunk := stream.read(chunk_size):
+        lines = (rest + chunk).split("\n")
+        rest = lines.pop()  # may be the start of a line split across chunks
+        for line in lines:
+            if line.strip():
+                total += int(line)
+                held = True
+            elif held:
+                yield total
+                total, held = 0, False
+    if rest.strip():
+        total += int(rest)
+        held = True
+    if held:
+        yield total
+
+
+def top_k(stream: IO[str], k: int, chunk_size: int = CHUNK_SIZE):
+    """Most calories held by the top k elves, in descending order.
+
+    Only the k largest totals are kept in memory.
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    heap: list[int] = []
+    for total in _totals(stream, chunk_size):
+        if len(heap) < k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+    return sorted(heap, reverse=True)
+
+
+def parse(f: IO[str]):
+    """Calories held by the top 3 elves, in descending order."""
+    return top_k(f, 3)
+
+
+def part_a(top: list[int]):
+    """Most calories held by one elf."""
+    return top[0]
+
+
+def part_b(top: list[int]):
+    """Total calories held by the top 3 elves."""
+    return sum(top)
 
 
 def main():
-    lines = sys.stdin.read().splitlines()
-    elves = sorted(sum(map(int, g[1])) for g in it.groupby(lines, bool) if g[0])
-    print(elves[-1])  # most held by one elf
-    print(sum(elves[-3:]))  # total held by top 3
+    top = parse(sys.stdin)
+    print(part_a(top))
+    print(part_b(top))
 
 
 if __name__ == "__main__":
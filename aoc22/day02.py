@@ -0,0 +1,46 @@
+import sys
+from typing import IO
+
+
+def _score(opponent: int, me: int):
+    """Score for a round: the shape I played plus 0, 3 or 6 for the outcome."""
+    return me + 1 + 3 * ((me - opponent + 1) % 3)
+
+
+scores: dict[bytes, tuple[int, int]] = {
+    f"{'ABC'[opponent]} {'XYZ'[column]}".encode(): (
+        _score(opponent, column),  # XYZ is the shape to play
+        _score(opponent, (opponent + column - 1) % 3),  # XYZ is lose/draw/win
+    )
+    for opponent in range(3)
+    for column in range(3)
+}
+"""Score of each of the nine possible rounds for part a and part b."""
+
+
+def count_rounds(data: bytes):
+    """Count how many times each of the nine possible rounds was played."""
+    return {r: data.count(r) for r in scores}
+
+
+def parse(f: IO):
+    data = f.read()
+    return count_rounds(data.encode() if isinstance(data, str) else data)
+
+
+def part_a(counts: dict[bytes, int]):
+    return sum(scores[r][0] * n for r, n in counts.items())
+
+
+def part_b(counts: dict[bytes, int]):
+    return sum(scores[r][1] * n for r, n in counts.items())
+
+
+def main():
+    counts = parse(sys.stdin.buffer)
+    print(part_a(counts))
+    print(part_b(counts))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,50 @@
 from functools import reduce
+import operator as op
 import string
 import sys
+from typing import IO, Sequence
 
 
-priority = {l: i + 1 for i, l in enumerate(string.ascii_letters)}
+_bits = {l: 1 << i for i, l in enumerate(string.ascii_letters)}
+"""Item types as bits, so the priority of an item is its bit length."""
+
+Rucksack = tuple[int, int]
+"""Bitmasks of the item types in each compartment of a rucksack."""
+
+
+def _mask(items: str):
+    return reduce(op.or_, map(_bits.__getitem__, items), 0)
+
+
+def parse(f: IO[str]) -> list[Rucksack]:
+    rucksacks = []
+    for line in f:
+        items = line.strip()
+        if not items:
+            continue
+        half = len(items) // 2
+        rucksacks.append((_mask(items[:half]), _mask(items[half:])))
+    return rucksacks
+
+
+def part_a(rucksacks: Sequence[Rucksack]):
+    """Total priority of the item type in both compartments of each rucksack."""
+    return sum((left & right).bit_length() for left, right in rucksacks)
+
+
+def part_b(rucksacks: Sequence[Rucksack], group_size: int = 3):
+    """Total priority of the item type carried by every elf in each group."""
+    masks = [left | right for left, right in rucksacks]
+    return sum(
+        reduce(op.and_, masks[i : i + group_size]).bit_length()
+        for i in range(0, len(masks) - group_size + 1, group_size)
+    )
 
 
 def main():
-    rucksacks = sys.stdin.read().splitlines()
-
-    # part a
-    find_error = lambda r, l: (set(r[:l]) & set(r[l:])).pop()
-    total = sum(priority[find_error(r, len(r) // 2)] for r in rucksacks)
-    print(total)
-
-    # part b
-    groups = zip(*([iter(rucksacks)] * 3))
-    items = (reduce(lambda x, y: x & y, map(set, g)).pop() for g in groups)
-    total = sum(priority[x] for x in items)
-    print(total)
+    rucksacks = parse(sys.stdin)
+    print(part_a(rucksacks))
+    print(part_b(rucksacks))
 
 
 if __name__ == "__main__":
@@ -1,28 +1,93 @@
-from collections.abc import Iterable
+from array import array
 import sys
+from typing import IO
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def part_a(lines: Iterable[str]):
-    ends = (tuple(int(c) for s in l.split(",") for c in s.split("-")) for l in lines)
-    check = lambda x: x[2] <= x[0] and x[1] <= x[3] or x[2] >= x[0] and x[1] >= x[3]
-    return sum(check(x) for x in ends)
 
+CHUNK_SIZE = 1 << 20
 
-def part_b(lines: Iterable[str]):
-    ends = (tuple(int(c) for s in l.split(",") for c in s.split("-")) for l in lines)
-    check = (
-        lambda x: x[2] <= x[0] <= x[3]
-        or x[2] <= x[1] <= x[3]
-        or x[0] <= x[2] <= x[1]
-        or x[0] <= x[3] <= x[1]
-    )
-    return sum(check(x) for x in ends)
+Columns = tuple
+"""Four columns of section pairs: first start, first end, second start, second end."""
+
+_separators = str.maketrans(",-", "  ")
+
+
+def _chunks(f: IO[str], chunk_size: int = CHUNK_SIZE):
+    """Yield the text of f a chunk at a time, split on line boundaries."""
+    rest = ""
+    while chunk := f.read(chunk_size):
+        text = rest + chunk
+        i = text.rfind("\n")
+        if i < 0:
+            rest = text
+            continue
+        yield text[:i]
+        rest = text[i + 1 :]
+    if rest:
+        yield rest
+
+
+def _columns(text: str) -> Columns:
+    ends = array("i", map(int, text.translate(_separators).split()))
+    return tuple(ends[i::4] for i in range(4))
+
+
+def _vectorize(columns: Columns) -> Columns:
+    if np is None:
+        return columns
+    return tuple(np.frombuffer(c, dtype=np.intc) for c in columns)
+
+
+def _contained(columns: Columns):
+    a0, a1, b0, b1 = columns
+    if np is not None and isinstance(a0, np.ndarray):
+        return int(np.count_nonzero((b0 <= a0) & (a1 <= b1) | (a0 <= b0) & (b1 <= a1)))
+    check = lambda a0, a1, b0, b1: b0 <= a0 and a1 <= b1 or a0 <= b0 and b1 <= a1
+    return sum(map(check, a0, a1, b0, b1))
+
+
+def _overlapping(columns: Columns):
+    a0, a1, b0, b1 = columns
+    if np is not None and isinstance(a0, np.ndarray):
+        return int(np.count_nonzero((b0 <= a1) & (a0 <= b1)))
+    check = lambda a0, a1, b0, b1: b0 <= a1 and a0 <= b1
+    return sum(map(check, a0, a1, b0, b1))
+
+
+def parse(f: IO[str], chunk_size: int = CHUNK_SIZE) -> Columns:
+    columns = tuple(array("i") for _ in range(4))
+    for text in _chunks(f, chunk_size):
+        for column, chunk_column in zip(columns, _columns(text)):
+            column.extend(chunk_column)
+    return _vectorize(columns)
+
+
+def count(f: IO[str], chunk_size: int = CHUNK_SIZE):
+    """Count (contained, overlapping) section pairs, a chunk of f at a time."""
+    contained = overlapping = 0
+    for text in _chunks(f, chunk_size):
+        columns = _vectorize(_columns(text))
+        contained += _contained(columns)
+        overlapping += _overlapping(columns)
+    return contained, overlapping
+
+
+def part_a(columns: Columns):
+    return _contained(columns)
+
+
+def part_b(columns: Columns):
+    return _overlapping(columns)
 
 
 def main():
-    lines = sys.stdin.read().splitlines()
-    print(part_a(lines))
-    print(part_b(lines))
+    columns = parse(sys.stdin)
+    print(part_a(columns))
+    print(part_b(columns))
 
 
 if __name__ == "__main__":
@@ -1,15 +1,17 @@
-import re
 import sys
-from typing import Generator, Optional
+from typing import IO, Optional
 
 
 class File:
+    __slots__ = ("name", "is_dir", "size", "total_size", "parent", "children")
+
     def __init__(self, name: str, is_dir: bool, size: int = 0):
         self.name = name
         self.is_dir = is_dir
         self.size = size
+        self.total_size = size  # of the file, or everything in the directory
         self.parent: Optional[File] = None
-        self.children: list[File] = []
+        self.children: dict[str, File] = {}
 
     def __str__(self):
         if self.is_dir:
@@ -18,23 +20,32 @@ class File:
             return f"- {self.name} (file, size={self.size})"
 
     def __iter__(self):
-        return iter(self.children)
+        return iter(self.children.values())
 
     def walk(self):
-        def _recursive_filetree(
-            node: File, depth: int = 0
-        ) -> Generator[tuple[int, File], None, None]:
+        """Yield (depth, node) for every node in the tree, depth first."""
+        stack: list[tuple[int, File]] = [(0, self)]
+        while stack:
+            depth, node = stack.pop()
             yield depth, node
-            for child in node.children:
-                yield from _recursive_filetree(child, depth + 1)
+            stack.extend((depth + 1, c) for c in reversed(node.children.values()))
 
-        return _recursive_filetree(self)
+    def append(self, other: "File", propagate: bool = True):
+        """Add a child, adding its size to this directory.
 
-    def append(self, other: "File"):
+        The size is also added to every parent directory if propagate is set.
+        """
         if not self.is_dir:
             raise ValueError("files can only be appended to a directory")
+        replaced = self.children.get(other.name)
         other.parent = self
-        self.children.append(other)
+        self.children[other.name] = other
+
+        delta = other.total_size - (replaced.total_size if replaced else 0)
+        node: Optional[File] = self
+        while node is not None:
+            node.total_size += delta
+            node = node.parent if propagate and delta else None
         return self
 
 
@@ -42,49 +53,64 @@ def print_filetree(root: File):
     print("\n".join(d * "  " + str(f) for d, f in root.walk()))
 
 
-_cd_pat = re.compile(r"^\$ cd (.+)")
-_ls_pat = re.compile(r"^\$ ls")
-_dir_pat = re.compile(r"^dir (.+)")
-_file_pat = re.compile(r"^(\d+) (.+)")
-
-
-def _explore_filesystem():
-    next(sys.stdin)  # skip the first line
-
+def _explore_filesystem(f: IO[str]):
     root = File("/", is_dir=True)
-    file = root
-    for line in sys.stdin:
-        if _ls_pat.match(line):
-            for line in sys.stdin:
-                if line.startswith("$"):
-                    break
-                elif mo := _dir_pat.match(line):
-                    file.append(File(mo.group(1), True))
-                elif mo := _file_pat.match(line):
-                    file.append(File(mo.group(2), False, int(mo.group(1))))
-
-        if mo := _cd_pat.match(line):
-            dir_name = mo.group(1)
-            if dir_name == "..":
-                if file.parent is None:
-                    raise ValueError("cannot cd above root")
-                file = file.parent
+
+    # sizes are only propagated to a parent on cd out of a directory, so
+    # appending to a deep directory doesn't walk all of its parents each time
+    path = [root]
+    pending = [0]  # size added to each directory on the path but not its parent
+
+    def cd_up():
+        if len(path) == 1:
+            raise ValueError("cannot cd above root")
+        path.pop()
+        size = pending.pop()
+        path[-1].total_size += size
+        pending[-1] += size
+
+    for line in f:
+        line = line.rstrip("\n")
+        if line.startswith("$ cd "):
+            dir_name = line[5:]
+            if dir_name == "/":
+                while len(path) > 1:
+                    cd_up()
+            elif dir_name == "..":
+                cd_up()
             else:
-                for child in file.children:
-                    if dir_name == child.name:
-                        if child.is_dir:
-                            file = child
-                            break
-                        else:
-                            raise ValueError("cannot cd into a non-directory")
-                else:
+                child = path[-1].children.get(dir_name)
+                if child is None:
                     raise ValueError("directory does not exist")
+                if not child.is_dir:
+                    raise ValueError("cannot cd into a non-directory")
+                path.append(child)
+                pending.append(0)
+        elif line.startswith("$ ls"):
+            continue
+        elif line.startswith("dir "):
+            if line[4:] not in path[-1].children:
+                path[-1].append(File(line[4:], True), propagate=False)
+        elif line[:1].isdigit():
+            size, _, name = line.partition(" ")
+            if name not in path[-1].children:
+                path[-1].append(File(name, False, int(size)), propagate=False)
+                pending[-1] += int(size)
+        elif line:
+            raise ValueError("invalid terminal output")
+
+    while len(path) > 1:
+        cd_up()
 
     return root
 
 
+def parse(f: IO[str]):
+    return _explore_filesystem(f)
+
+
 def _dirs_and_sizes(root: File):
-    return ((d, sum(f.size for _, f in d.walk())) for _, d in root.walk() if d.is_dir)
+    return ((d, d.total_size) for _, d in root.walk() if d.is_dir)
 
 
 def part_a(root: File):
@@ -92,10 +118,9 @@ def part_a(root: File):
 
 
 def part_b(root: File):
-    total_size = sum(f.size for _, f in root.walk())
     dirs = list(_dirs_and_sizes(root))
     for _, size in sorted(dirs, key=lambda t: t[1]):
-        if (70000000 - total_size) + size > 30000000:
+        if (70000000 - root.total_size) + size > 30000000:
             break
     else:
         raise ValueError("could not find a sufficient dir")
@@ -103,7 +128,7 @@ def part_b(root: File):
 
 
 if __name__ == "__main__":
-    root = _explore_filesystem()
+    root = parse(sys.stdin)
     print_filetree(root)
     print(part_a(root))
     print(part_b(root))
@@ -1,44 +1,131 @@
 from collections.abc import Sequence
-import itertools as it
+import os
 import sys
+from typing import IO
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-def part_a(lines: Sequence[str]):
-    h = len(lines)
-    w = len(lines[0])
 
-    vis = set()
-    for i, row in enumerate(lines[1:-1]):
-        vis |= set((i + 1, j) for j in range(1, w - 1) if row[j] > max(row[:j]))
-        vis |= set((i + 1, j) for j in range(1, w - 1) if row[j] > max(row[j + 1 :]))
+def _np_grid(buf: "np.ndarray"):
+    """View a buffer of newline-terminated rows of digits as a 2-D array."""
+    end = int(np.argmax(buf == ord("\n"))) if buf.size else 0
+    if not end:
+        return buf.reshape(1, -1)
+    w = end - 1 if buf[end - 1] == ord("\r") else end
+    stride = end + 1
+    h = (buf.size + stride - w) // stride
+    return np.lib.stride_tricks.as_strided(
+        buf, shape=(h, w), strides=(stride, 1), writeable=False
+    )
 
-    cols = list(map(list, zip(*lines)))
-    for i, col in enumerate(cols[1:-1]):
-        vis |= set((j, i + 1) for j in range(1, h - 1) if col[j] > max(col[:j]))
-        vis |= set((j, i + 1) for j in range(1, h - 1) if col[j] > max(col[j + 1 :]))
 
-    return (2 * (h + w) - 4) + len(vis)
+def parse(f: IO[str]):
+    data = f.read()
+    if np is None:
+        return data.splitlines()
+    return _np_grid(np.frombuffer(data.encode(), dtype=np.uint8))
 
 
-def part_b(lines: Sequence[str]):
+def load(path: str | os.PathLike):
+    """Load a forest from a file, memory-mapping it if NumPy is available."""
+    if np is None:
+        with open(path) as f:
+            return parse(f)
+    return _np_grid(np.memmap(path, dtype=np.uint8, mode="r"))
+
+
+def _np_orientations(*grids: "np.ndarray"):
+    """Yield views of the grids oriented so that looking toward column 0 is
+    looking left, right, up and down in turn.
+    """
+    yield grids
+    yield tuple(g[:, ::-1] for g in grids)
+    yield tuple(g.T for g in grids)
+    yield tuple(g.T[:, ::-1] for g in grids)
+
+
+def _np_part_a(grid: "np.ndarray"):
+    visible = np.zeros(grid.shape, dtype=bool)
+    for g, v in _np_orientations(grid, visible):
+        tallest = np.maximum.accumulate(g, axis=1)
+        v[:, 0] = True
+        v[:, 1:] |= g[:, 1:] > tallest[:, :-1]
+    return int(np.count_nonzero(visible))
+
+
+def _np_part_b(grid: "np.ndarray"):
+    scores = np.ones(grid.shape, dtype=np.int64)
+    for g, s in _np_orientations(grid, scores):
+        g = np.ascontiguousarray(g)
+        cols = np.arange(g.shape[1], dtype=np.int32)
+        dist = np.empty(g.shape, dtype=np.int32)
+        nearest = np.zeros(g.shape, dtype=np.int32)
+        for ht in range(ord("0"), ord("9") + 1):
+            # nearest column before each tree that is at least ht tall, or the edge
+            blockers = np.maximum.accumulate(np.where(g >= ht, cols, 0), axis=1)
+            nearest[:, 1:] = blockers[:, :-1]
+            np.copyto(dist, cols - nearest, where=g == ht)
+        s *= dist
+    return int(scores.max())
+
+
+def _sightlines(h: int, w: int):
+    """Flat grid indices along every row and column, from each direction."""
+    for r in range(h):
+        row = range(r * w, (r + 1) * w)
+        yield row
+        yield row[::-1]
+    for c in range(w):
+        col = range(c, h * w, w)
+        yield col
+        yield col[::-1]
+
+
+def part_a(lines: Sequence[str]):
+    """Number of trees visible from outside the grid."""
+    if np is not None and isinstance(lines, np.ndarray):
+        return _np_part_a(lines)
     h, w = len(lines), len(lines[0])
-    cols = list(map(list, zip(*lines)))
+    grid = "".join(lines).encode()
+
+    visible = bytearray(h * w)
+    for sightline in _sightlines(h, w):
+        tallest = -1
+        for i in sightline:
+            if grid[i] > tallest:
+                visible[i] = 1
+                tallest = grid[i]
+                if tallest == ord("9"):
+                    break  # nothing further along can be seen
 
-    def view_score(ht, seq):
-        return min(len(seq), 1 + sum(1 for _ in it.takewhile(lambda t: ht > t, seq)))
+    return visible.count(1)
+
+
+def part_b(lines: Sequence[str]):
+    """Highest scenic score of any tree."""
+    if np is not None and isinstance(lines, np.ndarray):
+        return _np_part_b(lines)
+    h, w = len(lines), len(lines[0])
+    grid = "".join(lines).encode()
 
-    def scenic_score(r: int, c: int):
-        ht = lines[r][c]
-        left = view_score(ht, lines[r][:c][::-1])
-        right = view_score(ht, lines[r][c + 1 :])
-        up = view_score(ht, cols[c][:r][::-1])
-        down = view_score(ht, cols[c][r + 1 :])
-        return left * right * up * down
+    scores = [1] * (h * w)
+    for sightline in _sightlines(h, w):
+        # trees behind, in decreasing height, that are not blocked by a closer tree
+        stack: list[tuple[int, int]] = []
+        for pos, i in enumerate(sightline):
+            ht = grid[i]
+            while stack and stack[-1][0] < ht:
+                stack.pop()
+            scores[i] *= pos - stack[-1][1] if stack else pos
+            stack.append((ht, pos))
 
-    return max(scenic_score(r, c) for r in range(h) for c in range(w))
+    return max(scores)
 
 
 if __name__ == "__main__":
-    lines = sys.stdin.read().splitlines()
+    lines = parse(sys.stdin)
     print(part_a(lines))
     print(part_b(lines))
@@ -1,83 +1,129 @@
-import re
+from array import array
 import sys
-from typing import Iterable
+from typing import IO, Iterable, Optional
 
 
-class Knot:
-    """A Knot can move up/down/left/right or follow another knot."""
+Move = tuple[int, int, int]
+"""A move of the head: the x and y of one step, and the number of steps."""
 
-    def __init__(self, x, y):
-        self.x = x
-        self.y = y
+_directions = {"R": (1, 0), "U": (0, -1), "L": (-1, 0), "D": (0, 1)}
+
+
+def _key(x: int, y: int):
+    """Pack a location into a single int.
+
+    The packing is linear, so the keys of locations along a line are a range.
+    """
+    return (x << 32) + y
+
+
+class Rope:
+    """A rope of knots. The head moves and every other knot follows the one ahead."""
+
+    def __init__(self, num_knots: int, tracked: Optional[Iterable[int]] = None):
+        """Make a rope, recording the locations visited by the tracked knots.
+
+        Only the tail is tracked by default.
+        """
+        if num_knots < 1:
+            raise ValueError("a rope needs at least one knot")
+        self.xs = array("i", [0]) * num_knots
+        self.ys = array("i", [0]) * num_knots
+        self.visited: list[Optional[set[int]]] = [None] * num_knots
+        for k in [num_knots - 1] if tracked is None else tracked:
+            self.visited[k] = {_key(0, 0)}
+
+    @property
+    def tail_visited(self):
+        return self.visited[-1]
 
     def __repr__(self):
-        return f"Knot({self.x}, {self.y})"
-
-    def move(self, direction: str):
-        match direction:
-            case "R":
-                self.x += 1
-            case "U":
-                self.y -= 1
-            case "L":
-                self.x -= 1
-            case "D":
-                self.y += 1
-            case _:
-                raise ValueError("invalid direction")
-
-    def follow(self, other):
-        xdist = other.x - self.x
-        ydist = other.y - self.y
-        if abs(xdist) > 1 or abs(xdist) + abs(ydist) > 2:
-            self.x += xdist // abs(xdist)
-        if abs(ydist) > 1 or abs(xdist) + abs(ydist) > 2:
-            self.y += ydist // abs(ydist)
-
-
-instr_pat = re.compile(r"(\w) (\d+)")
-"""Regex pattern to match instruction lines."""
-
-
-def part_a(lines: Iterable[str]):
-    head = Knot(0, 0)
-    tail = Knot(0, 0)
-    tail_visited: set[tuple[int, int]] = set([(0, 0)])
-
-    for instr in lines:
-        mo = instr_pat.match(instr)
-        if mo is None:
-            raise ValueError("bad instruction")
-
-        direction, amount = mo.group(1, 2)
-        for _ in range(int(amount)):
-            head.move(direction)
-            tail.follow(head)
-            tail_visited.add((tail.x, tail.y))  # Record where tail's been
-
-    return len(tail_visited)
-
-
-def part_b(lines: Iterable[str]):
-    num_knots = 10
-    knots = [Knot(0, 0) for _ in range(num_knots)]
-    tail_visited: set[tuple[int, int]] = set([(0, 0)])
-
-    for instr in lines:
-        mo = instr_pat.match(instr)
-        if mo is None:
-            raise ValueError("bad instruction")
-        direction, amount = mo.group(1, 2)
-        for _ in range(int(amount)):
-            knots[0].move(direction)  # The head moves
-            for k in range(1, num_knots):
-                knots[k].follow(knots[k - 1])  # Other knots follow the one ahead each
-            tail_visited.add((knots[-1].x, knots[-1].y))  # Record where tail's been
-
-    return len(tail_visited)
+        return f"Rope({len(self.xs)})"
+
+    def move(self, dx: int, dy: int, steps: int):
+        """Move the head steps times by (dx, dy)."""
+        xs, ys, visited = self.xs, self.ys, self.visited
+        n = len(xs)
+        # knots 0..p trail one step behind each other, so they move in lockstep
+        # and are only updated at the end; knot k joined them at step joined[k]
+        p = 0
+        while p < n - 1 and xs[p] - xs[p + 1] == dx and ys[p] - ys[p + 1] == dy:
+            p += 1
+        joined = [0] * (p + 1)
+
+        for i in range(1, steps + 1):
+            if p == n - 1:
+                break  # the whole rope moves in lockstep
+            # the knots behind the straight part follow it one step at a time
+            x = xs[p] + dx * (i - joined[p])
+            y = ys[p] + dy * (i - joined[p])
+            for k in range(p + 1, n):
+                xdist = x - xs[k]
+                ydist = y - ys[k]
+                if -1 <= xdist <= 1 and -1 <= ydist <= 1:
+                    break  # this knot stays put, so the ones behind it do too
+                xs[k] += (xdist > 0) - (xdist < 0)
+                ys[k] += (ydist > 0) - (ydist < 0)
+                if visited[k] is not None:
+                    visited[k].add(_key(xs[k], ys[k]))
+                if k == p + 1 and x - xs[k] == dx and y - ys[k] == dy:
+                    p += 1
+                    joined.append(i)
+                x, y = xs[k], ys[k]
+
+        stride = _key(dx, dy)
+        for k in range(p + 1):
+            remaining = steps - joined[k]
+            if visited[k] is not None:
+                key = _key(xs[k], ys[k])
+                visited[k].update(
+                    range(key + stride, key + stride * (remaining + 1), stride)
+                )
+            xs[k] += dx * remaining
+            ys[k] += dy * remaining
+
+
+def parse(f: IO[str]) -> list[Move]:
+    moves = []
+    for line in f:
+        if not line.strip():
+            continue
+        direction, steps = line.split()
+        if direction not in _directions:
+            raise ValueError("invalid direction")
+        moves.append((*_directions[direction], int(steps)))
+    return moves
+
+
+def tail_visits(moves: Iterable[Move], num_knots: int):
+    """Number of locations the tail of a rope visits."""
+    rope = Rope(num_knots)
+    for move in moves:
+        rope.move(*move)
+    return len(rope.tail_visited)
+
+
+def knot_visits(moves: Iterable[Move], num_knots: int):
+    """Number of locations visited by each knot of a rope, head first.
+
+    A knot only follows the knots ahead of it, so the count for knot k is also
+    the tail visit count of a rope of k + 1 knots.
+    """
+    rope = Rope(num_knots, tracked=range(num_knots))
+    for move in moves:
+        rope.move(*move)
+    return [len(v) for v in rope.visited if v is not None]
+
+
+def part_a(moves: Iterable[Move]):
+    return tail_visits(moves, 2)
+
+
+def part_b(moves: Iterable[Move]):
+    return tail_visits(moves, 10)
 
 
 if __name__ == "__main__":
-    lines = sys.stdin.readlines()
-    print(part_a(lines))
-    print(part_b(lines))
+    moves = parse(sys.stdin)
+    print(part_a(moves))
+    print(part_b(moves))
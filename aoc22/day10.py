@@ -1,71 +1,63 @@
-from collections import deque
+from array import array
 import sys
-import re
+from typing import IO, Iterable
 
 
-instr_pat = re.compile(r"(\w+)(?: (-?\d+)|)")
+def compile_trace(lines: Iterable[str]):
+    """Run the program, returning the value of X during each cycle.
 
-
-def run(lines, callback):
-    """Run the instructions, calling callback during each cycle."""
-    it = iter(lines)
-
-    queue = deque()
+    The value during cycle n is at index n - 1.
+    """
+    trace = array("i")
     x = 1
-    cycle = 1
-    block = 0
-
-    while True:
-        if block:
-            block -= 1
-        else:
-            if queue:
-                x += queue.popleft()
-            try:
-                mo = instr_pat.match(next(it))
-            except StopIteration:
-                break
-            if mo is None:
-                break
-            if mo.group(1) == "addx":
-                queue.append(int(mo.group(2)))
-                block = 1
+    for line in lines:
+        if line.startswith("addx "):
+            trace.append(x)
+            trace.append(x)
+            x += int(line[5:])
+        elif line.startswith("noop"):
+            trace.append(x)
+        elif line.strip():
+            raise ValueError("invalid instruction")
+    return trace
 
-        callback(cycle, x)
-        cycle += 1
 
+def x_during(trace: array, cycle: int):
+    """Value of X during a cycle."""
+    if not 1 <= cycle <= len(trace):
+        raise IndexError("cycle out of range")
+    return trace[cycle - 1]
 
-def part_a(lines):
-    result = [0]
 
-    def sample(cycle, x):
-        if not (cycle - 20) % 40:
-            result[0] += cycle * x
+def signal_strength(trace: array, cycles: Iterable[int]):
+    """Sum of each cycle times the value of X during it."""
+    return sum(c * x_during(trace, c) for c in cycles)
 
-    run(lines, sample)
 
-    return result[0]
+def render(trace: array, width: int = 40):
+    """Draw the complete rows of the CRT, one pixel per cycle."""
+    rows = []
+    for start in range(0, len(trace) - width + 1, width):
+        row = trace[start : start + width]
+        rows.append(
+            "".join("#" if x - 1 <= i <= x + 1 else "." for i, x in enumerate(row))
+        )
+    return "\n".join(rows)
 
 
-def part_b(lines):
-    class State:
-        buf = []
-        display = []
+def parse(f: IO[str]):
+    return compile_trace(f)
 
-    state = State()
 
-    def draw(_, x):
-        state.buf.append("#" if x - 1 <= len(state.buf) <= x + 1 else ".")
-        if len(state.buf) == 40:
-            state.display.append("".join(state.buf))
-            state.buf = []
+def part_a(trace: array):
+    return signal_strength(trace, range(20, len(trace) + 1, 40))
 
-    run(lines, draw)
 
-    return "\n".join(state.display)
+def part_b(trace: array):
+    return render(trace)
 
 
 if __name__ == "__main__":
-    lines = sys.stdin.readlines()
-    print(part_a(lines))
-    print(part_b(lines))
+    trace = parse(sys.stdin)
+    print(part_a(trace))
+    print(part_b(trace))
@@ -1,13 +1,18 @@
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import functools
 import io
 import math
 import operator as op
+import os
 import re
 import sys
-from typing import Iterable, IO
+from typing import Callable, Iterable, IO, Optional
 
 
 class Item:
+    __slots__ = ("worry_level",)
+
     def __init__(self, worry_level: int):
         self.worry_level = worry_level
 
@@ -15,7 +20,28 @@ class Item:
 _ops = {"+": op.add, "*": op.mul}
 
 
+def _compile_operation(opstring: str) -> Callable[[int], int]:
+    """Compile an operation like "* 19" or "* old" into a function of old."""
+    symbol, arg = opstring.split()
+    if symbol not in _ops:
+        raise ValueError("invalid operation")
+    func = _ops[symbol]
+    if arg == "old":
+        return lambda old: func(old, old)
+    return functools.partial(func, int(arg))
+
+
 class Monkey:
+    __slots__ = (
+        "id",
+        "opstring",
+        "operation",
+        "divisor",
+        "throw_to",
+        "inspections",
+        "items",
+    )
+
     def __init__(
         self,
         id: int,
@@ -26,6 +52,7 @@ class Monkey:
     ):
         self.id = id
         self.opstring = opstring
+        self.operation = _compile_operation(opstring)
         self.divisor = divisor
         self.throw_to = throw_to
         self.inspections = 0
@@ -42,10 +69,7 @@ class Monkey:
     def inspect(self):
         """Pop an item, inspect it, and return it."""
         item = self.items.popleft()
-        args = self.opstring.split()
-        item.worry_level = _ops[args[0]](
-            item.worry_level, int(args[1]) if args[1].isdigit() else item.worry_level
-        )
+        item.worry_level = self.operation(item.worry_level)
         self.inspections += 1
         return item
 
@@ -91,6 +115,103 @@ def parse_monkeys(config: IO[str]) -> list[Monkey]:
     return monkeys
 
 
+parse = parse_monkeys
+
+
+def monkey_business(inspections: Iterable[int]):
+    return op.mul(*sorted(inspections)[-2:])
+
+
+Rule = tuple[str, int, tuple[int, int]]
+"""What a monkey does with an item: its operation, test divisor, and throw_to."""
+
+
+def _item_inspections(
+    rules: list[tuple[Callable[[int], int], int, tuple[int, int]]],
+    monkey_id: int,
+    worry_level: int,
+    rounds: int,
+):
+    """Count the inspections of each monkey on one item over a number of rounds.
+
+    Worry levels are kept modulo the lcm of the divisors, so the item's state at
+    the start of a round (holder, worry level) eventually repeats. The rounds
+    are then a cycle, and only its first occurrence is simulated.
+    """
+    lcm = math.lcm(*(divisor for _, divisor, _ in rules))
+    counts = [0] * len(rules)
+    seen: dict[tuple[int, int], int] = {}
+    history: list[tuple[int, ...]] = []  # monkeys that inspected the item each round
+
+    state = (monkey_id, worry_level)
+    for round_ in range(rounds):
+        if state in seen:
+            cycle = history[seen[state] :]
+            repeats, rest = divmod(rounds - round_, len(cycle))
+            for i, inspectors in enumerate(cycle):
+                for m in inspectors:
+                    counts[m] += repeats + (i < rest)
+            break
+        seen[state] = round_
+
+        m, worry_level = state
+        inspectors = []
+        while True:
+            operation, divisor, throw_to = rules[m]
+            inspectors.append(m)
+            counts[m] += 1
+            worry_level = operation(worry_level) % lcm
+            to = throw_to[0 if not worry_level % divisor else 1]
+            if to < m:
+                break  # the catcher already had its turn this round
+            m = to
+        history.append(tuple(inspectors))
+        state = (to, worry_level)
+
+    return counts
+
+
+def _items_inspections(
+    rules: list[Rule], items: Iterable[tuple[int, int]], rounds: int
+):
+    """Count the inspections of each monkey on (holder, worry level) items."""
+    compiled = [(_compile_operation(o), d, t) for o, d, t in rules]
+    counts = [0] * len(rules)
+    for monkey_id, worry_level in items:
+        item_counts = _item_inspections(compiled, monkey_id, worry_level, rounds)
+        counts = [a + b for a, b in zip(counts, item_counts)]
+    return counts
+
+
+def inspections(monkeys: list[Monkey], rounds: int, max_workers: Optional[int] = 1):
+    """Count the inspections of each monkey over a number of rounds, without relief.
+
+    Items never interact, so each is followed on its own until its path repeats,
+    which takes time proportional to the cycle length rather than the rounds.
+    Unless max_workers is 1, the items are split across a process pool of that
+    many workers (None for one per CPU), and each worker is only sent the
+    monkeys' rules and its own items.
+    """
+    rules: list[Rule] = [(m.opstring, m.divisor, m.throw_to) for m in monkeys]
+    items = [(m.id, item.worry_level) for m in monkeys for item in m.items]
+    if max_workers == 1:
+        return _items_inspections(rules, items, rounds)
+
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as executor:
+        num_chunks = 4 * workers
+        chunks = [items[i::num_chunks] for i in range(min(num_chunks, len(items)))]
+        counts = [0] * len(monkeys)
+        for chunk_counts in executor.map(
+            _items_inspections,
+            [rules] * len(chunks),
+            chunks,
+            [rounds] * len(chunks),
+        ):
+            counts = [a + b for a, b in zip(counts, chunk_counts)]
+    return counts
+
+
 def part_a(monkeys: list[Monkey]):
     for _ in range(20):
         for monkey in monkeys:
@@ -99,7 +220,7 @@ def part_a(monkeys: list[Monkey]):
                 item.worry_level //= 3
                 monkey.throw(item, monkeys)
 
-    return op.mul(*sorted(m.inspections for m in monkeys)[-2:])
+    return monkey_business(m.inspections for m in monkeys)
 
 
 def part_b(monkeys: list[Monkey]):
@@ -111,7 +232,7 @@ def part_b(monkeys: list[Monkey]):
                 item.worry_level %= lcm
                 monkey.throw(item, monkeys)
 
-    return op.mul(*sorted(m.inspections for m in monkeys)[-2:])
+    return monkey_business(m.inspections for m in monkeys)
 
 
 if __name__ == "__main__":
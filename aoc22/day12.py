@@ -1,108 +1,225 @@
+from array import array
+from collections import Counter, OrderedDict
+import heapq
 import math
-from queue import Queue
 import string
 import sys
-from typing import Optional, Sequence
+from typing import IO, Optional, Sequence
 
 
-class Elevation:
-    """An elevation in the height map."""
-
-    _heightvals = {l: i for i, l in enumerate(string.ascii_lowercase)}
-    _heightvals["S"] = 0
-    _heightvals["E"] = 25
-
-    def __init__(self, elevation: str):
-        self.elevation = elevation
-        self.value = self._heightvals[elevation]
-
-    def __str__(self):
-        return self.elevation
-
-    def __int__(self):
-        return self.value
-
-    def __sub__(self, other):
-        return int(self) - int(other)
-
-    def __eq__(self, other):
-        return int(self) == int(other)
+_heights = bytes.maketrans(
+    (string.ascii_lowercase + "SE").encode(), bytes([*range(26), 0, 25])
+)
+"""Translation table from elevation letters to heights."""
 
 
 class HeightMap:
-    """Map of coordinates to elevations."""
+    """Grid of heights, stored row by row in a flat bytearray."""
+
+    def __init__(self, data: Sequence[str], cache_size: int = 8, field_after: int = 2):
+        """Make a height map from rows of elevation letters.
 
-    def __init__(self, data: Sequence[Sequence[str]]):
+        Paths to a target queried at least field_after times are answered from
+        a search of the whole map back from the target, and the cache_size most
+        recently used of those searches are kept.
+        """
+        if cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
         self.width = len(data[0])
         self.height = len(data)
-        self._map = {
-            (x, y): Elevation(v) for y, r in enumerate(data) for x, v in enumerate(r)
-        }
-        self.start = next(k for k in self._map if self._map[k].elevation == "S")
-        self.end = next(k for k in self._map if self._map[k].elevation == "E")
-        self._cache: dict[tuple[int, int], int] = {}
-        self._explore()
-
-    def __getitem__(self, key):
-        return self._map[key]
-
-    def _paths(self, x: int, y: int):
-        curr = self[(x, y)]
-        if x - 1 >= 0 and curr - self[(x - 1, y)] <= 1:
-            yield (x - 1, y)
-        if y - 1 >= 0 and curr - self[(x, y - 1)] <= 1:
-            yield (x, y - 1)
-        if x + 1 < self.width and curr - self[(x + 1, y)] <= 1:
-            yield (x + 1, y)
-        if y + 1 < self.height and curr - self[(x, y + 1)] <= 1:
-            yield (x, y + 1)
-
-    def _explore(self):
-        """explore the map and cache fewest steps to the end location"""
-        queue = Queue()
-
-        visited = set()
-        queue.put((0, self.end))
-
-        while item := queue.get():
-            steps, loc = item
-
-            self._cache[loc] = steps
-
-            if loc not in visited:
-                visited.add(loc)
-                for next_loc in self._paths(*loc):
-                    if next_loc in visited:
-                        continue
-                    new_item = (steps + 1, next_loc)
-                    queue.put(new_item)
-
-            if queue.empty():
+        raw = "".join(data).encode()
+        if len(raw) != self.width * self.height:
+            raise ValueError("rows must all be the same width")
+        self.heights = bytearray(raw.translate(_heights))
+        self.start = self._location(raw.index(b"S"))
+        self.end = self._location(raw.index(b"E"))
+        self.cache_size = cache_size
+        self.field_after = field_after
+        self._fields: OrderedDict[int, array] = OrderedDict()
+        self._queries: Counter[int] = Counter()
+
+    def __getitem__(self, key: tuple[int, int]):
+        return self.heights[self._index(key)]
+
+    def _index(self, loc: tuple[int, int]):
+        x, y = loc
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError("location is off the map")
+        return y * self.width + x
+
+    def _location(self, i: int):
+        return i % self.width, i // self.width
+
+    def _neighbours(self, i: int):
+        w = self.width
+        x = i % w
+        if x > 0:
+            yield i - 1
+        if i >= w:
+            yield i - w
+        if x < w - 1:
+            yield i + 1
+        if i + w < len(self.heights):
+            yield i + w
+
+    def _explore(self, end: int):
+        """Breadth-first search back from the end, a step at a time, returning the
+        fewest steps from each location to the end, or -1 if the end can't be
+        reached from it."""
+        w, h = self.width, self.height
+        # search a copy of the map with a border around it that counts as already
+        # reached, so neighbours are fixed offsets that need no bounds checks
+        pw = w + 2
+        heights = bytearray(pw * (h + 2))
+        steps = array("i", [0]) * (pw * (h + 2))
+        unreached = array("i", [-1]) * w
+        for y in range(h):
+            row = (y + 1) * pw + 1
+            heights[row : row + w] = self.heights[y * w : (y + 1) * w]
+            steps[row : row + w] = unreached
+
+        start = (end // w + 1) * pw + end % w + 1
+        steps[start] = 0
+        frontier = [start]
+        next_steps = 0
+        while frontier:
+            next_steps += 1
+            reached = []
+            append = reached.append
+            for i in frontier:
+                lowest = heights[i] - 1  # lowest height that can climb to here
+                # the neighbours are unrolled here since this is the hot loop
+                j = i - 1
+                if steps[j] < 0 and heights[j] >= lowest:
+                    steps[j] = next_steps
+                    append(j)
+                j = i + 1
+                if steps[j] < 0 and heights[j] >= lowest:
+                    steps[j] = next_steps
+                    append(j)
+                j = i - pw
+                if steps[j] < 0 and heights[j] >= lowest:
+                    steps[j] = next_steps
+                    append(j)
+                j = i + pw
+                if steps[j] < 0 and heights[j] >= lowest:
+                    steps[j] = next_steps
+                    append(j)
+            frontier = reached
+
+        field = array("i")
+        for y in range(h):
+            row = (y + 1) * pw + 1
+            field.extend(steps[row : row + w])
+        return field
+
+    def _field(self, end: int):
+        """Fewest steps from each location to end, kept in an LRU cache."""
+        field = self._fields.get(end)
+        if field is None:
+            field = self._fields[end] = self._explore(end)
+            if len(self._fields) > self.cache_size:
+                self._fields.popitem(last=False)
+        self._fields.move_to_end(end)
+        return field
+
+    def _route_by_field(self, start: int, end: int):
+        field = self._field(end)
+        if field[start] < 0:
+            return None
+        route = [start]
+        i = start
+        while i != end:
+            ceiling = self.heights[i] + 1
+            i = next(
+                j
+                for j in self._neighbours(i)
+                if field[j] == field[i] - 1 and self.heights[j] <= ceiling
+            )
+            route.append(i)
+        return route
+
+    def _route_by_astar(self, start: int, end: int):
+        heights, w, n = self.heights, self.width, len(self.heights)
+        ex, ey = end % w, end // w
+        distance = lambda i: abs(i % w - ex) + abs(i // w - ey)
+
+        steps = array("i", [-1]) * n
+        came_from = array("i", [-1]) * n
+        steps[start] = 0
+        # ties go to the location furthest along, so the search heads straight for
+        # the end rather than widening out over every equally promising location
+        heap = [(distance(start), 0, start)]
+        while heap:
+            _, neg_steps, i = heapq.heappop(heap)
+            if i == end:
                 break
+            i_steps = -neg_steps
+            if i_steps > steps[i]:
+                continue  # already reached in fewer steps
+            ceiling = heights[i] + 1
+            j_steps = i_steps + 1
+            for j in self._neighbours(i):
+                if heights[j] <= ceiling and (steps[j] < 0 or j_steps < steps[j]):
+                    steps[j] = j_steps
+                    came_from[j] = i
+                    heapq.heappush(heap, (j_steps + distance(j), -j_steps, j))
+        else:
+            return None
+
+        route = [end]
+        while route[-1] != start:
+            route.append(came_from[route[-1]])
+        return route[::-1]
+
+    def shortest_path(
+        self,
+        start: Optional[tuple[int, int]] = None,
+        end: Optional[tuple[int, int]] = None,
+    ):
+        """Number of steps and the locations along a shortest path (w/o climbing
+        gear) from start to end, or (inf, []) if there is none."""
+        s = self._index(start or self.start)
+        e = self._index(end or self.end)
+        self._queries[e] += 1
+        if e in self._fields or self._queries[e] >= self.field_after:
+            route = self._route_by_field(s, e)
+        else:
+            route = self._route_by_astar(s, e)
+        if route is None:
+            return math.inf, []
+        return len(route) - 1, [self._location(i) for i in route]
 
     def fewest_steps(self, start: Optional[tuple[int, int]] = None):
         """number of steps for the shortest path (w/o climbing gear) from start to end"""
-        start = start or self.start
-        return self._cache.get(start, math.inf)
+        steps = self._field(self._index(self.end))[self._index(start or self.start)]
+        return math.inf if steps < 0 else steps
+
+    def fewest_steps_from_zeroes(self):
+        """number of steps for the shortest path (w/o climbing gear) from any
+        location at 0 elevation to end"""
+        steps = self._field(self._index(self.end))
+        reachable = (s for s, h in zip(steps, self.heights) if h == 0 and s >= 0)
+        return min(reachable, default=math.inf)
 
     def zeroes(self):
         """locations at 0 elevation"""
-        yield from (x for x in self._map if self._map[x] == 0)
+        yield from (self._location(i) for i, h in enumerate(self.heights) if h == 0)
+
+
+def parse(f: IO[str]):
+    return HeightMap(f.read().splitlines())
 
 
-def part_a(data: str):
-    height_map = HeightMap(data.splitlines())
-    shortest = height_map.fewest_steps()
-    return shortest
+def part_a(height_map: HeightMap):
+    return height_map.fewest_steps()
 
 
-def part_b(data: str):
-    height_map = HeightMap(data.splitlines())
-    shortest = min(height_map.fewest_steps(s) for s in height_map.zeroes())
-    return shortest
+def part_b(height_map: HeightMap):
+    return height_map.fewest_steps_from_zeroes()
 
 
 if __name__ == "__main__":
-    data = sys.stdin.read()
-    print(part_a(data))
-    print(part_b(data))
+    height_map = parse(sys.stdin)
+    print(part_a(height_map))
+    print(part_b(height_map))
@@ -1,45 +1,54 @@
-from itertools import zip_longest
+import bisect
+import functools
+import itertools as it
 import json
 import sys
+from typing import IO, Iterable, Sequence
 
 PacketData = list["PacketData"] | int
 
-EMPTY = -1
-
-
-def _lt(px: PacketData, py: PacketData):
-    def _compare_recursive(px: PacketData, py: PacketData):
-        if isinstance(px, int) and isinstance(py, int):
-            yield px < py, px > py
-
-        else:
-            if isinstance(px, list) and isinstance(py, int):
-                if py == EMPTY:  # right side ran out first
-                    yield False, True
-                else:
-                    py = [py]
-            elif isinstance(px, int) and isinstance(py, list):
-                if px == EMPTY:  # left side ran out first
-                    yield True, False
-                else:
-                    px = [px]
-
-            assert isinstance(px, list) and isinstance(py, list)
-            for px_, py_ in zip_longest(px, py, fillvalue=-1):
-                yield from _compare_recursive(px_, py_)
-
-    for lt, gt in _compare_recursive(px, py):
-        if lt:
-            return True
-        elif gt:
-            return False
-        # elements were equal, keep going
-    else:
-        # all elements were equal
-        return False
+
+def compare(px: PacketData, py: PacketData):
+    """Compare packet data, returning -1, 0 or 1 like a cmp function."""
+    if isinstance(px, int) and isinstance(py, int):
+        return (px > py) - (px < py)
+    if isinstance(px, int):
+        px = [px]
+    elif isinstance(py, int):
+        py = [py]
+
+    stack: list[tuple[list, list, int]] = []  # lists being compared, and where
+    i = 0
+    while True:
+        if i == len(px) or i == len(py):
+            if len(px) != len(py):
+                return -1 if i == len(px) else 1  # one side ran out first
+            if not stack:
+                return 0
+            px, py, i = stack.pop()
+            i += 1
+            continue
+
+        x, y = px[i], py[i]
+        if type(x) is int and type(y) is int:
+            if x != y:
+                return -1 if x < y else 1
+            i += 1
+            continue
+
+        stack.append((px, py, i))
+        px = [x] if type(x) is int else x
+        py = [y] if type(y) is int else y
+        i = 0
+
+
+packet_key = functools.cmp_to_key(lambda px, py: compare(px.data, py.data))
+"""Sort key for packets."""
 
 
 class Packet:
+    __slots__ = ("data",)
+
     def __init__(self, data: list[PacketData]):
         self.data = data
 
@@ -47,22 +56,20 @@ class Packet:
         return f"Packet({json.dumps(self.data)})"
 
     def __lt__(self, other: "Packet"):
-        return not self.__eq__(other) and _lt(self.data, other.data)
+        return compare(self.data, other.data) < 0
 
     def __le__(self, other: "Packet"):
-        return self.__eq__(other) or _lt(self.data, other.data)
+        return compare(self.data, other.data) <= 0
 
     def __eq__(self, other: "Packet"):
         return self.data == other.data
 
 
-def read_packets():
-    data = sys.stdin.read()
-    return list(
-        Packet(json.loads(line))
-        for raw_pair in data.strip().split("\n\n")
-        for line in raw_pair.split("\n")
-    )
+def read_packets(f: IO[str]):
+    return [Packet(json.loads(line)) for line in f if line.strip()]
+
+
+parse = read_packets
 
 
 def part_a(packets: list[Packet]):
@@ -70,15 +77,40 @@ def part_a(packets: list[Packet]):
     return sum(idx + 1 for idx, pair in enumerate(pairs) if pair[0] <= pair[1])
 
 
+def ranks(packets: Iterable[Packet], queries: Sequence[Packet]):
+    """Positions (from 1) the query packets would have if they were appended to
+    the packets and all of them were stably sorted.
+
+    The packets are only iterated once, and each is placed among the sorted
+    queries by binary search, so nothing else has to be sorted or kept.
+    """
+    order = sorted(range(len(queries)), key=lambda q: packet_key(queries[q]))
+    keys = [packet_key(queries[q]) for q in order]
+
+    # before[k] counts the packets sorted before the kth query in order
+    before = [0] * (len(queries) + 1)
+    for packet in packets:
+        before[bisect.bisect_left(keys, packet_key(packet))] += 1
+    before = list(it.accumulate(before))
+
+    result = [0] * len(queries)
+    for k, q in enumerate(order):
+        result[q] = 1 + before[k] + k  # k queries are also sorted before it
+    return result
+
+
+def rank(packets: Iterable[Packet], query: Packet):
+    """Position (from 1) the query packet would have if sorted in with the packets."""
+    return ranks(packets, [query])[0]
+
+
 def part_b(packets: list[Packet]):
     dividers = [Packet([[2]]), Packet([[6]])]
-    packets = sorted(packets + dividers)
-    divider_indexes = tuple(i + 1 for i, p in enumerate(packets) if p in dividers)
-    assert len(divider_indexes) == 2
-    return divider_indexes[0] * divider_indexes[1]
+    first, second = ranks(packets, dividers)
+    return first * second
 
 
 if __name__ == "__main__":
-    packets = read_packets()
+    packets = read_packets(sys.stdin)
     print(part_a(packets))
     print(part_b(packets))
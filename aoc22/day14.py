@@ -20,49 +20,90 @@ def _scan_rock_traces(fobj: IO[str]):
 
 
 class Cave:
-    def __init__(self):
-        self._rock = set()
-        self._sand = set()
-        self.scan_floor = 0
-        self.floor = 0
+    """Cave occupancy, stored as one int bitset per row.
+
+    Bit i of a row is the cell at x = x0 + i. Rows run from the top down to the
+    floor, and x0 is far enough left for any sand resting on the floor.
+    """
+
+    def __init__(self, x0: int = 0, floor: int = 0):
+        self._x0 = x0
+        self._rock = [0] * (floor + 1)
+        self._filled = [0] * (floor + 1)  # rock or sand
+        self._sand = 0
+        self.scan_floor = floor - 2
+        self.floor = floor
 
     @classmethod
     def scan(cls, fobj: IO[str]):
-        cave = cls()
-        for trace in _scan_rock_traces(fobj):
-            for start, stop in it.pairwise(trace):
-                if start[0] == stop[0]:
-                    for y in range(min(start[1], stop[1]), max(start[1], stop[1]) + 1):
-                        cave._rock.add((start[0], y))
-                elif start[1] == stop[1]:
-                    for x in range(min(start[0], stop[0]), max(start[0], stop[0]) + 1):
-                        cave._rock.add((x, start[1]))
-                else:
-                    raise ValueError("lines must be vertical or horizontal")
-        cave.scan_floor = max(y for _, y in cave._rock)
-        cave.floor = cave.scan_floor + 2
+        segments = [
+            (start, stop)
+            for trace in _scan_rock_traces(fobj)
+            for start, stop in it.pairwise(trace)
+        ]
+        scan_floor = max(y for segment in segments for _, y in segment)
+        x0 = min(min(x for segment in segments for x, _ in segment), START[0])
+        x0 = min(x0, START[0] - (scan_floor + 2))  # leftmost sand on the floor
+
+        cave = cls(x0, scan_floor + 2)
+        for start, stop in segments:
+            if start[0] == stop[0]:
+                bit = 1 << (start[0] - x0)
+                for y in range(min(start[1], stop[1]), max(start[1], stop[1]) + 1):
+                    cave._rock[y] |= bit
+            elif start[1] == stop[1]:
+                x_min, x_max = sorted((start[0], stop[0]))
+                bits = ((1 << (x_max - x_min + 1)) - 1) << (x_min - x0)
+                cave._rock[start[1]] |= bits
+            else:
+                raise ValueError("lines must be vertical or horizontal")
+        cave._filled = list(cave._rock)
         return cave
 
     def filled(self, loc: tuple[int, int]):
-        return loc in self._rock or loc in self._sand
+        return (self._filled[loc[1]] >> (loc[0] - self._x0)) & 1
 
     def pour(self):
-        start = START
-        while True:
-            loc = next(it.filterfalse(self.filled, _options(start)), None)
+        """Pour grains of sand from the START until it's covered, yielding the
+        location where each comes to rest.
+
+        A grain falls along the previous grain's path until the cell where that
+        grain rested, so each grain resumes from the cell before that one.
+        """
+        if self.filled(START):
+            return  # already covered
+        path = [START]
+        while path:
+            loc = next(it.filterfalse(self.filled, _options(path[-1])), None)
             if loc and loc[1] < self.floor:
-                start = loc
+                path.append(loc)
             else:
-                self._sand.add(start)
-                yield start
-                if start[1] > 0:
-                    start = START
-                else:
-                    break
+                rest = path.pop()
+                self._filled[rest[1]] |= 1 << (rest[0] - self._x0)
+                self._sand += 1
+                yield rest
+
+    def sweep(self):
+        """Count the cells sand can reach from the START, resting on the floor.
+
+        Every such cell ends up filled with sand, so this is how much sand
+        pouring until the START is covered would leave, found row by row
+        instead of grain by grain.
+        """
+        row = 1 << (START[0] - self._x0)
+        reached = 1
+        for y in range(START[1] + 1, self.floor):
+            row = (row | row << 1 | row >> 1) & ~self._rock[y]
+            reached += row.bit_count()
+        return reached
 
     @property
     def sand(self):
-        return len(self._sand)
+        return self._sand
+
+
+def parse(f: IO[str]):
+    return Cave.scan(f)
 
 
 def part_a(cave: Cave):
@@ -70,12 +111,14 @@ def part_a(cave: Cave):
     return cave.sand - 1
 
 
-def part_b(cave: Cave):
+def part_b(cave: Cave, sweep: bool = True):
+    if sweep:
+        return cave.sweep()
     deque(cave.pour(), 0)  # efficiently exhaust the iterator
     return cave.sand
 
 
 if __name__ == "__main__":
-    cave = Cave.scan(sys.stdin)
+    cave = parse(sys.stdin)
     print(part_a(cave))
     print(part_b(cave))
@@ -1,10 +1,23 @@
+from concurrent.futures import ProcessPoolExecutor
 import itertools as it
+import math
+import os
 import re
 import sys
+from typing import IO, Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 PART_A_Y = 2000000
 PART_B_XY_MAX = 4000000
+BAND_CELLS = 1 << 18
+
+Intervals = list[tuple[int, int]]
+"""Disjoint, sorted (first x, last x) intervals covered in a row."""
 
 
 _sensor_report_pat = re.compile(
@@ -25,102 +38,299 @@ def _distance(p1: tuple[int, int], p2: tuple[int, int]):
     return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
 
 
+def _rotate(p: tuple[int, int]):
+    """Rotate a location by 45 degrees to (u, v) = (x + y, x - y), which turns
+    the diamonds around sensors into squares."""
+    return p[0] + p[1], p[0] - p[1]
+
+
+Box = tuple[int, int, int, int]
+"""Bounds (first u, first v, last u, last v) in rotated coordinates."""
+
+
 class Sensor:
     def __init__(self, loc: tuple[int, int], beacon: tuple[int, int]):
         self.loc = loc
         self.beacon = beacon
         self.distance = _distance(self.loc, self.beacon)
-        self.ybound = (loc[1] - self.distance, loc[1] + self.distance)
-        self.xbound = (loc[0] - self.distance, loc[0] + self.distance)
-        self.box = (
-            (self.xbound[0], loc[1]),
-            (loc[0], self.ybound[0]),
-            (self.xbound[1], loc[1]),
-            (loc[0], self.ybound[1]),
+        u, v = _rotate(loc)
+        self.square = (
+            u - self.distance,
+            v - self.distance,
+            u + self.distance,
+            v + self.distance,
         )
 
     def xbound_at(self, y: int):
-        xbound = []
-        for v1, v2 in it.pairwise((self.box[-1],) + self.box):
-            inside_ybound = (v1[1] > y) != (v2[1] > y)
-            if not inside_ybound:
-                continue
-            xbound.append(int((v2[0] - v1[0]) * (y - v1[1]) / (v2[1] - v1[1]) + v1[0]))
-        return tuple(xbound)
+        """The first and last x covered in row y, or () if the row is out of reach."""
+        reach = self.distance - abs(y - self.loc[1])
+        if reach < 0:
+            return ()
+        return self.loc[0] - reach, self.loc[0] + reach
 
     def __contains__(self, p: tuple[int, int]):
-        if (
-            p[0] < self.xbound[0]
-            or p[0] > self.xbound[1]
-            or p[1] < self.ybound[0]
-            or p[1] > self.ybound[1]
-        ):
-            return False
+        return _distance(self.loc, p) <= self.distance
+
+
+def _encloses(outer: Box, inner: Box):
+    return (
+        outer[0] <= inner[0]
+        and outer[1] <= inner[1]
+        and inner[2] <= outer[2]
+        and inner[3] <= outer[3]
+    )
+
+
+def _bounding_box(boxes: list[Box]) -> Box:
+    return (
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    )
 
-        contains = False
-        for x in self.xbound_at(p[1]):
-            if p[0] == x:
-                return True  # the point is on the boundary
-            if p[0] < x:
-                contains = not contains
 
-        return contains
+def _tiles(entries: list, tile_size: int):
+    """Group boxed entries into tiles of nearby boxes: slabs across u, each cut
+    into tiles along v."""
+    if not entries:
+        return
+    num_slabs = math.ceil(math.sqrt(len(entries) / tile_size))
+    slab_size = tile_size * num_slabs
+    entries = sorted(entries, key=lambda e: e[0][0] + e[0][2])
+    for i in range(0, len(entries), slab_size):
+        slab = sorted(entries[i : i + slab_size], key=lambda e: e[0][1] + e[0][3])
+        for j in range(0, len(slab), tile_size):
+            yield slab[j : j + tile_size]
 
 
-def _read_sensors():
+class SensorIndex:
+    """R-tree of the squares sensors cover in rotated coordinates, bulk loaded
+    by sorting them into tiles."""
+
+    def __init__(self, sensors: list[Sensor], node_size: int = 16):
+        if node_size < 2:
+            raise ValueError("node_size must be at least 2")
+        self.sensors = sensors
+        # a node is its bounding box, its children, and if those are sensor indices
+        entries: list = [(s.square, i) for i, s in enumerate(sensors)]
+        leaf = True
+        while True:
+            nodes = [
+                (_bounding_box([box for box, _ in tile]), [c for _, c in tile], leaf)
+                for tile in _tiles(entries, node_size)
+            ]
+            if len(nodes) <= 1:
+                break
+            entries = [(node[0], node) for node in nodes]
+            leaf = False
+        self._root = nodes[0] if nodes else None
+
+    def enclosing(self, box: Box):
+        """Yield the indices of the sensors whose squares enclose a box."""
+        if self._root is None:
+            return
+        stack = [self._root]
+        while stack:
+            node_box, children, leaf = stack.pop()
+            if not _encloses(node_box, box):
+                continue
+            if leaf:
+                yield from (
+                    i for i in children if _encloses(self.sensors[i].square, box)
+                )
+            else:
+                stack.extend(children)
+
+    def covering(self, p: tuple[int, int]):
+        """Yield the sensors that cover a location."""
+        u, v = _rotate(p)
+        return (self.sensors[i] for i in self.enclosing((u, v, u, v)))
+
+
+def _read_sensors(f: IO[str]):
     sensors: list[Sensor] = []
-    for line in sys.stdin:
+    for line in f:
         sensors.append(Sensor(*_parse_sensor_beacon(line)))
 
+    # a sensor only adds coverage if no sensor before it encloses it
     sensors = sorted(sensors, key=lambda s: s.distance, reverse=True)
+    index = SensorIndex(sensors)
+    return [
+        s
+        for i, s in enumerate(sensors)
+        if not any(j < i for j in index.enclosing(s.square))
+    ]
 
-    unique_sensors = [sensors[0]]
-    for sensor in sensors[1:]:
-        if any(all(v in s for v in sensor.box) for s in unique_sensors):
-            continue
-        unique_sensors.append(sensor)
 
-    return unique_sensors
+def parse(f: IO[str]):
+    return _read_sensors(f)
 
 
-def part_a(sensors: list[Sensor], y=PART_A_Y):
-    sensors = sorted(sensors, key=lambda s: s.xbound[0])
-    xbounds = [s.xbound_at(y) for s in sensors]
+Disc = tuple[int, int, int]
+"""The x, y and reach of a sensor."""
+
 
-    no_beacon = 0
-    x = min(xb[0] for xb in xbounds if xb)
-    for xbound in xbounds:
-        if xbound and xbound[0] <= x <= xbound[1]:
-            no_beacon += 1 + xbound[1] - x
-            x = xbound[1] + 1
+def _merge(bounds: list[tuple[int, int]]) -> Intervals:
+    merged: Intervals = []
+    for lo, hi in sorted(bounds):
+        if merged and lo <= merged[-1][1] + 1:
+            if hi > merged[-1][1]:
+                merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
 
+
+def _band_coverage(discs: list[Disc], rows: list[int]) -> list[Intervals]:
+    top, bottom = min(rows, default=0), max(rows, default=0)
+    discs = [(sx, sy, d) for sx, sy, d in discs if sy - d <= bottom and top <= sy + d]
+    if np is None or not discs:
+        coverage = []
+        for y in rows:
+            bounds = []
+            for sx, sy, d in discs:
+                reach = d - abs(y - sy)
+                if reach >= 0:
+                    bounds.append((sx - reach, sx + reach))
+            coverage.append(_merge(bounds))
+        return coverage
+
+    # one (row, sensor) matrix of bounds, sorted by first x along each row
+    sx, sy, d = np.array(discs, dtype=np.int64).reshape(-1, 3).T
+    reach = d - np.abs(np.array(rows, dtype=np.int64)[:, None] - sy)
+    lo = np.where(reach >= 0, sx - reach, np.iinfo(np.int64).max)
+    order = np.argsort(lo, axis=1, kind="stable")
+    lo = np.take_along_axis(lo, order, axis=1)
+    hi = np.take_along_axis(sx + reach, order, axis=1)
+    reached = np.take_along_axis(reach >= 0, order, axis=1)
+
+    # an interval starts wherever a bound isn't touched by the ones before it
+    last = np.maximum.accumulate(np.where(reached, hi, np.iinfo(np.int64).min), axis=1)
+    starts = reached.copy()
+    starts[:, 1:] &= lo[:, 1:] > last[:, :-1] + 1
+    counts = reached.sum(axis=1)
+
+    # each interval ends just before the next one starts, or at its row's last bound
+    row, col = np.nonzero(starts)
+    end = np.append(col[1:], 0) - 1
+    row_ends = np.append(row[1:], -1) != row
+    end[row_ends] = counts[row[row_ends]] - 1
+    intervals = zip(lo[row, col].tolist(), last[row, end].tolist())
+    sizes = np.bincount(row, minlength=len(rows)).tolist()
+    return [list(it.islice(intervals, n)) for n in sizes]
+
+
+def coverage(
+    sensors: list[Sensor],
+    rows: Iterable[int],
+    max_workers: Optional[int] = 1,
+    band_size: Optional[int] = None,
+) -> dict[int, Intervals]:
+    """Merged intervals of x that the sensors cover in each row.
+
+    Rows are worked on band_size at a time, by default as many as keep a band to
+    BAND_CELLS (row, sensor) pairs. Unless max_workers is 1, the bands are split
+    across a process pool of that many workers (None for one per CPU).
+    """
+    discs = [(*s.loc, s.distance) for s in sensors]
+    rows = list(rows)
+    band_size = band_size or max(1, BAND_CELLS // max(1, len(discs)))
+    bands = [rows[i : i + band_size] for i in range(0, len(rows), band_size)]
+    if max_workers == 1:
+        results = list(map(_band_coverage, [discs] * len(bands), bands))
+    else:
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(_band_coverage, [discs] * len(bands), bands))
+    return dict(zip(rows, it.chain.from_iterable(results)))
+
+
+def part_a(sensors: list[Sensor], y=PART_A_Y):
+    covered = sum(hi - lo + 1 for lo, hi in coverage(sensors, [y])[y])
     beacons = set(s.beacon for s in sensors)
-    return no_beacon - sum(b[1] == y for b in beacons)
+    return covered - sum(b[1] == y for b in beacons)
 
 
-def part_b(sensors: list[Sensor], xy_max=PART_B_XY_MAX):
-    sensors = sorted(sensors, key=lambda s: s.loc[0])
-    signal = None
-    for y in range(xy_max + 1):
-        x = 0
-        sensors_ = sensors.copy()
-        while x <= xy_max:
-            for sensor in sensors_:
-                if (x, y) in sensor:
-                    x = sensor.xbound_at(y)[1] + 1
-                    sensors_.remove(sensor)
-                    break
-            else:
-                signal = (x, y)
-                break
-        if signal:
+def _first_uncovered(lo: int, hi: int, covered: Intervals, step: int = 1):
+    """First of lo, lo + step, ... up to hi that isn't in a covered interval, or
+    None."""
+    t = lo
+    for a, b in sorted(covered):
+        if a > t:
             break
+        if b >= t:
+            t = b + 1 + (b + 1 - lo) % step
+    return t if t <= hi else None
+
+
+def _perimeter_rows(
+    sensors: list[Sensor], x_range: tuple[int, int], y_range: tuple[int, int]
+):
+    """Yield the first row with an uncovered location within the ranges along
+    each edge just outside a sensor's diamond, for the edges that have one.
+
+    The edges are lines of constant u = x + y or v = x - y, and along them the
+    squares the sensors cover in (u, v) cut out intervals. Locations on a line
+    are every other value of the other coordinate.
+    """
+    (x0, x1), (y0, y1) = x_range, y_range
+    squares = [(*_rotate(s.loc), s.distance) for s in sensors]
+    for su, sv, d in squares:
+        r = d + 1
+        for u in (su - r, su + r):
+            # y = (u - v) / 2 grows as v shrinks, so search along -v
+            lo = -min(sv + r, 2 * x1 - u, u - 2 * y0)
+            hi = -max(sv - r, 2 * x0 - u, u - 2 * y1)
+            lo += (lo - u) % 2
+            covered = [
+                (-tv - td, td - tv) for tu, tv, td in squares if abs(u - tu) <= td
+            ]
+            if (t := _first_uncovered(lo, hi, covered, 2)) is not None:
+                yield (u + t) // 2
+        for v in (sv - r, sv + r):
+            lo = max(su - r, 2 * x0 - v, 2 * y0 + v)
+            hi = min(su + r, 2 * x1 - v, 2 * y1 + v)
+            lo += (lo - v) % 2
+            covered = [
+                (tu - td, tu + td) for tu, tv, td in squares if abs(v - tv) <= td
+            ]
+            if (t := _first_uncovered(lo, hi, covered, 2)) is not None:
+                yield (t - v) // 2
 
-    assert signal is not None
+
+def find_beacon(
+    sensors: list[Sensor],
+    x_range: tuple[int, int] = (0, PART_B_XY_MAX),
+    y_range: tuple[int, int] = (0, PART_B_XY_MAX),
+):
+    """First location, row by row, within the (inclusive) ranges that no sensor
+    covers, or None if they cover all of it.
+
+    The first uncovered location is either the top left corner of the area, or
+    covered from above or from the left, so it lies just outside the diamond of
+    the sensor covering that. Only the rows where such edges first leave a
+    location uncovered have their coverage checked.
+    """
+    (x0, x1), (y0, y1) = x_range, y_range
+    if x0 > x1 or y0 > y1:
+        return None
+    rows = sorted({y0, *_perimeter_rows(sensors, x_range, y_range)})
+    covered = coverage(sensors, rows)
+    for y in rows:
+        if (x := _first_uncovered(x0, x1, covered[y])) is not None:
+            return x, y
+    return None
+
+
+def part_b(sensors: list[Sensor], xy_max=PART_B_XY_MAX):
+    signal = find_beacon(sensors, (0, xy_max), (0, xy_max))
+    if signal is None:
+        raise ValueError("no distress beacon in the search area")
     return signal[0] * 4000000 + signal[1]
 
 
 if __name__ == "__main__":
-    sensors = _read_sensors()
+    sensors = parse(sys.stdin)
     print(part_a(sensors))
     print(part_b(sensors))
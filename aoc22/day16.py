@@ -2,9 +2,10 @@ from collections import deque
 from dataclasses import dataclass, field
 import heapq
 import itertools as it
+import math
 import re
 import sys
-from typing import Iterable, Optional
+from typing import IO, Iterable, Optional
 
 
 class Valve:
@@ -12,8 +13,6 @@ class Valve:
         self.label = label
         self.flow_rate = flow_rate
         self.tunnels: list[Valve] = []
-        self.navtimes: dict[str, int] = {}
-        self.opened: Optional[int] = None
 
     def __repr__(self):
         return f"Valve('{self.label}', {self.flow_rate})"
@@ -21,48 +20,29 @@ class Valve:
     def __str__(self):
         return f"Valve {self.label}: flow_rate={self.flow_rate}, tunnels=({', '.join(t.label for t in self.tunnels)});"
 
-    def update_navigation_times(self):
-        """Calculate and store the minutes to reachable valves from this valve."""
-        visited = set([self.label])
-        queue: deque[tuple[int, Valve]] = deque([(0, self)])
+    def navigation_times(self, valves: list["Valve"]):
+        """Calculate the minutes to each of the valves from this valve, or inf
+        for those that can't be reached."""
+        times = {self.label: 0}
+        queue: deque[Valve] = deque([self])
         while queue:
-            time, curr = queue.popleft()
-            visited.add(curr.label)
-            if time != 0:
-                self.navtimes[curr.label] = time
+            curr = queue.popleft()
             for valve in curr.tunnels:
-                if valve.label not in visited:
-                    queue.append((time + 1, valve))
+                if valve.label not in times:
+                    times[valve.label] = times[curr.label] + 1
+                    queue.append(valve)
+        return [times.get(v.label, math.inf) for v in valves]
 
 
 @dataclass(order=True)
 class PathNode:
     minute: int
     cost: int
-    label: str
+    valve: int
+    opened: int = 0
+    """Bitmask of the valves opened along the path."""
     prev: Optional["PathNode"] = field(default=None, compare=False)
 
-    def visited(self, label: str):
-        """Check if the path has visited the provided label."""
-        if self.label == label:
-            return True
-        node = self
-        while node := node.prev:
-            if node.label == label:
-                return True
-        return False
-
-    def path(self):
-        """Materialize the path to this node as a list, minus the start node AA."""
-        if self.label == "AA":
-            return []
-        node = self
-        path = [node]
-        while node := node.prev:
-            if node.label != "AA":
-                path.append(node)
-        return path
-
 
 class ValveSystem:
     _scan_pat = re.compile(
@@ -71,6 +51,17 @@ class ValveSystem:
 
     def __init__(self, valves: Iterable[Valve]):
         self.valves = {v.label: v for v in valves}
+        if "AA" not in self.valves:
+            raise ValueError("no start valve AA")
+
+        # only AA and the valves worth opening matter, as indices into a dense
+        # matrix of the minutes between them; AA is index 0
+        self.relevant = [self.valves["AA"]] + sorted(
+            (v for v in self.valves.values() if v.flow_rate and v.label != "AA"),
+            key=lambda v: v.label,
+        )
+        self.flow_rates = [v.flow_rate for v in self.relevant]
+        self.distances = [v.navigation_times(self.relevant) for v in self.relevant]
 
     @classmethod
     def scan(cls, f):
@@ -92,48 +83,45 @@ class ValveSystem:
         for label, to_labels in tunnels.items():
             valves[label].tunnels.extend(valves[l] for l in to_labels)
 
-        for valve in valves.values():
-            valve.update_navigation_times()
-
         return cls(list(sorted(valves.values(), key=lambda v: v.label)))
 
     def find_paths(self, total_time: int):
         """Find the PathNode endpoints of all valve-opening paths that can be navigated in the alotted time."""
-        heap: list[PathNode] = [PathNode(0, 0, "AA")]
+        flow_rates, distances = self.flow_rates, self.distances
+        heap: list[PathNode] = [PathNode(0, 0, 0)]
         endpoints: list[PathNode] = []
 
         while heap:
             curr = heapq.heappop(heap)
-            curr_valve = self.valves[curr.label]
+            navtimes = distances[curr.valve]
 
-            options: list[tuple[int, Valve]] = []
-            for label, navtime in curr_valve.navtimes.items():
-                valve = self.valves[label]
-                if curr.visited(label) or valve.flow_rate == 0:
+            for valve in range(1, len(flow_rates)):
+                if curr.opened >> valve & 1:
                     continue
-                time_opened = 1 + curr.minute + navtime
+                time_opened = 1 + curr.minute + navtimes[valve]
                 if time_opened > total_time:
                     continue
-                options.append((time_opened, valve))
-
-            if options:
-                for time_opened, valve in options:
-                    time_remaining = total_time - time_opened
-                    node = PathNode(
-                        time_opened,
-                        curr.cost + -1 * time_remaining * valve.flow_rate,
-                        valve.label,
-                        prev=curr,
-                    )
-                    heapq.heappush(heap, node)
-
-            if curr.label != "AA":
+                time_remaining = total_time - time_opened
+                node = PathNode(
+                    time_opened,
+                    curr.cost + -1 * time_remaining * flow_rates[valve],
+                    valve,
+                    curr.opened | 1 << valve,
+                    prev=curr,
+                )
+                heapq.heappush(heap, node)
+
+            if curr.prev is not None:
                 # every non-start node is a possible endpoint
                 endpoints.append(curr)
 
         return endpoints
 
 
+def parse(f: IO[str]):
+    return ValveSystem.scan(f)
+
+
 def part_a(valve_system: ValveSystem):
     """Maximum pressure that can be released by 1 worker in 30 minutes."""
     endpoints = valve_system.find_paths(30)
@@ -145,11 +133,10 @@ def part_b(valve_system: ValveSystem):
     """Maximum pressure that can be released by 2 workers in 26 minutes."""
     # find the max pressure for each distinct set of valves opened by a worker
     #   e.g. opening JJ, BB, CC will release more pressure than BB, CC, JJ
-    paths: dict[frozenset[str], PathNode] = {}
+    paths: dict[int, PathNode] = {}
     for path in valve_system.find_paths(26):
-        key = frozenset(p.label for p in path.path())
-        if key not in paths or path.cost < paths[key].cost:
-            paths[key] = path
+        if path.opened not in paths or path.cost < paths[path.opened].cost:
+            paths[path.opened] = path
 
     # 2 workers will never open the same valve, so identify disjoint paths
     disjoint_paths = ((a, b) for a, b in it.combinations(paths, 2) if not a & b)
@@ -159,6 +146,6 @@ def part_b(valve_system: ValveSystem):
 
 
 if __name__ == "__main__":
-    valve_system = ValveSystem.scan(sys.stdin)
+    valve_system = parse(sys.stdin)
     print(part_a(valve_system))
     print(part_b(valve_system))
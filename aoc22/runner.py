@@ -0,0 +1,63 @@
+"""Load a day's solution on demand and time its parse and parts separately."""
+from dataclasses import dataclass
+import importlib
+import importlib.util
+import io
+import time
+from types import ModuleType
+from typing import Any, Callable, Iterable
+
+
+PARTS = ("a", "b")
+
+
+@dataclass
+class Timing:
+    wall: float
+    cpu: float
+
+    def __str__(self):
+        return f"wall {self.wall * 1000:10.3f} ms  cpu {self.cpu * 1000:10.3f} ms"
+
+
+@dataclass
+class PartResult:
+    day: int
+    part: str
+    answer: Any
+    parse: Timing
+    solve: Timing
+
+
+def timed(func: Callable, *args):
+    """Call func, returning its result and how long it took."""
+    wall, cpu = time.perf_counter(), time.process_time()
+    result = func(*args)
+    return result, Timing(time.perf_counter() - wall, time.process_time() - cpu)
+
+
+def load(day: int, part: str) -> ModuleType:
+    """Import the module solving a part of a day, and nothing else.
+
+    A day is solved by aoc22.dayNN, or by aoc22.dayNN_a and aoc22.dayNN_b when
+    its parts are separate scripts.
+    """
+    for name in (f"aoc22.day{day:02}", f"aoc22.day{day:02}_{part}"):
+        if importlib.util.find_spec(name) is not None:
+            return importlib.import_module(name)
+    raise ValueError(f"no solution for day {day}")
+
+
+def run(day: int, data: str, parts: Iterable[str] = PARTS):
+    """Parse data and solve each part, yielding a PartResult per part.
+
+    The input is parsed again for every part since some parts consume it.
+    """
+    for part in parts:
+        module = load(day, part)
+        solve = getattr(module, f"part_{part}", None)
+        if solve is None:
+            continue
+        parsed, parse_time = timed(module.parse, io.StringIO(data))
+        answer, solve_time = timed(solve, parsed)
+        yield PartResult(day, part, answer, parse_time, solve_time)
@@ -1,14 +1,246 @@
+from array import array
+import io
 from pathlib import Path
+import random
 
-from aoc22 import day04
+import pytest
+
+from aoc22 import (
+    bench,
+    day01,
+    day02,
+    day03,
+    day04,
+    day07,
+    day08,
+    day09,
+    day10,
+    day11,
+    day12,
+    day13,
+    day14,
+    day15,
+    day16,
+    runner,
+)
 
 
 def get_test_data(filename):
     return (Path(__file__).parent / "data" / filename).read_text()
 
 
+def test_day01():
+    data = get_test_data("day01.txt")
+    top = day01.parse(io.StringIO(data))
+    assert day01.part_a(top) == 24000
+    assert day01.part_b(top) == 45000
+    top = day01.top_k(io.StringIO(data), 4, chunk_size=3)
+    assert top == [24000, 11000, 10000, 6000]
+
+
+def test_day02():
+    counts = day02.parse(io.StringIO(get_test_data("day02.txt")))
+    assert day02.part_a(counts) == 15
+    assert day02.part_b(counts) == 12
+
+
+def test_day03():
+    rucksacks = day03.parse(io.StringIO(get_test_data("day03.txt")))
+    assert day03.part_a(rucksacks) == 157
+    assert day03.part_b(rucksacks) == 70
+    rucksacks = day03.parse(io.StringIO("aBcB\ndBeB\n"))
+    assert day03.part_a(rucksacks) == 56
+    assert day03.part_b(rucksacks, group_size=2) == 28
+
+
 def test_day04():
     data = get_test_data("day04.txt")
-    lines = data.splitlines()
-    assert day04.part_a(lines) == 2
-    assert day04.part_b(lines) == 4
+    columns = day04.parse(io.StringIO(data))
+    assert day04.part_a(columns) == 2
+    assert day04.part_b(columns) == 4
+    assert day04.count(io.StringIO(data), chunk_size=5) == (2, 4)
+
+
+def test_day04_without_numpy(monkeypatch):
+    monkeypatch.setattr(day04, "np", None)
+    data = get_test_data("day04.txt")
+    columns = day04.parse(io.StringIO(data))
+    assert all(isinstance(c, array) for c in columns)
+    assert day04.part_a(columns) == 2
+    assert day04.part_b(columns) == 4
+    assert day04.count(io.StringIO(data), chunk_size=5) == (2, 4)
+
+
+def test_runner():
+    results = list(runner.run(4, get_test_data("day04.txt")))
+    assert [(r.part, r.answer) for r in results] == [("a", 2), ("b", 4)]
+
+
+def test_bench_compare():
+    baseline = {
+        "04a/day04.txt": bench.Measurement("2", 0.0, 1.0),
+        "04b/day04.txt": bench.Measurement("4", 0.0, 1.0),
+    }
+    results = {
+        "04a/day04.txt": bench.Measurement("2", 0.0, 2.0),
+        "04b/day04.txt": bench.Measurement("5", 0.0, 1.0),
+    }
+    assert list(bench.compare(baseline, baseline)) == []
+    assert len(list(bench.compare(results, baseline, threshold=1.5))) == 2
+    assert len(list(bench.compare(results, baseline, threshold=2.5))) == 1
+    del results["04a/day04.txt"]
+    assert list(bench.compare(results, baseline, threshold=2.5)) == [
+        "04b/day04.txt: answer changed from '4' to '5'",
+        "04a/day04.txt: missing from the results",
+    ]
+
+
+def test_day07():
+    root = day07.parse(io.StringIO(get_test_data("day07.txt")))
+    assert root.total_size == 48381165
+    assert day07.part_a(root) == 95437
+    assert day07.part_b(root) == 24933642
+
+    deep = "".join(f"$ ls\n1 f.txt\ndir d{i}\n$ cd d{i}\n" for i in range(5000))
+    root = day07.parse(io.StringIO(deep))
+    assert root.total_size == 5000
+    assert max(d for d, _ in root.walk()) == 5000
+
+
+def test_day08():
+    data = get_test_data("day08.txt")
+    for grid in (data.splitlines(), day08.parse(io.StringIO(data))):
+        assert day08.part_a(grid) == 21
+        assert day08.part_b(grid) == 8
+    grid = day08.load(Path(__file__).parent / "data" / "day08.txt")
+    assert day08.part_a(grid) == 21
+    assert day08.part_b(grid) == 8
+
+
+def test_day09():
+    moves = day09.parse(io.StringIO(get_test_data("day09.txt")))
+    assert day09.part_a(moves) == 13
+    assert day09.part_b(moves) == 1
+    moves = day09.parse(io.StringIO(get_test_data("day09b.txt")))
+    assert day09.part_b(moves) == 36
+    visits = day09.knot_visits(moves, 10)
+    assert visits == [day09.tail_visits(moves, n) for n in range(1, 11)]
+    assert visits[1] == 88 and visits[9] == 36
+    assert day09.tail_visits([(1, 0, 100000)], 50) == 100000 - 48
+
+
+def test_day10():
+    trace = day10.parse(io.StringIO(get_test_data("day10.txt")))
+    assert day10.part_a(trace) == 13140
+    assert (
+        day10.part_b(trace).splitlines()[0]
+        == "##..##..##..##..##..##..##..##..##..##.."
+    )
+    assert day10.x_during(trace, 220) == 18
+
+
+def test_day11():
+    data = get_test_data("day11.txt")
+    assert day11.part_a(day11.parse(io.StringIO(data))) == 10605
+    assert day11.part_b(day11.parse(io.StringIO(data))) == 2713310158
+    monkeys = day11.parse(io.StringIO(data))
+    assert day11.inspections(monkeys, 10000) == [52166, 47830, 1938, 52013]
+    assert day11.inspections(monkeys, 10000, max_workers=2) == [
+        52166,
+        47830,
+        1938,
+        52013,
+    ]
+
+
+def test_day12():
+    height_map = day12.parse(io.StringIO(get_test_data("day12.txt")))
+    assert day12.part_a(height_map) == 31
+    assert day12.part_b(height_map) == 29
+    assert height_map.fewest_steps((0, 4)) == 29
+    for _ in range(height_map.field_after):  # by A*, then by distance field
+        steps, route = height_map.shortest_path((0, 4))
+        assert steps == 29 and len(route) == 30
+        assert route[0] == (0, 4) and route[-1] == height_map.end
+    assert height_map.shortest_path((2, 0), (0, 0)) == (2, [(2, 0), (1, 0), (0, 0)])
+    with pytest.raises(ValueError):
+        day12.HeightMap(["SE"], cache_size=0)
+
+
+def test_day13():
+    packets = day13.parse(io.StringIO(get_test_data("day13.txt")))
+    assert day13.part_a(packets) == 13
+    assert day13.part_b(packets) == 140
+    assert day13.compare([[1], [2, 3, 4]], [[1], 4]) == -1
+    assert day13.compare([1, [2]], [[1], 2]) == 0
+    assert day13.Packet([2]) <= day13.Packet([[2]])
+    dividers = [day13.Packet([[6]]), day13.Packet([[2]])]
+    assert day13.ranks(iter(packets), dividers) == [14, 10]
+    assert day13.rank(packets, dividers[0]) == 13
+
+
+def test_day14():
+    data = get_test_data("day14.txt")
+    cave = day14.parse(io.StringIO(data))
+    assert day14.part_a(cave) == 24
+    assert day14.part_b(cave, sweep=False) == 93
+    assert day14.part_b(day14.parse(io.StringIO(data))) == 93
+    cave = day14.parse(io.StringIO("495,1 -> 505,1"))
+    assert day14.part_a(cave) == 0
+    assert day14.part_b(cave, sweep=False) == 1
+
+
+def test_day15():
+    sensors = day15.parse(io.StringIO(get_test_data("day15.txt")))
+    assert day15.part_a(sensors, 10) == 26
+    assert day15.part_b(sensors, 20) == 56000011
+    assert day15.find_beacon(sensors, (0, 20), (0, 20)) == (14, 11)
+    assert day15.find_beacon(sensors, (0, 13), (0, 20)) is None
+    reports = io.StringIO(
+        "Sensor at x=0, y=1: closest beacon is at x=-3, y=7\n"
+        "Sensor at x=9, y=4: closest beacon is at x=14, y=1\n"
+    )
+    assert day15.find_beacon(day15.parse(reports), (0, 12), (0, 12)) == (3, 8)
+    covered = day15.coverage(sensors, range(21), max_workers=2, band_size=8)
+    assert covered[10] == [(-2, 24)]
+    assert covered[11] == [(-3, 13), (15, 25)]
+    assert covered == day15.coverage(sensors, range(21))
+    index = day15.SensorIndex(sensors, node_size=2)
+    assert {s.loc for s in index.covering((2, 10))} == {(8, 7), (2, 0), (0, 11)}
+    assert list(index.covering((14, 11))) == []
+    assert list(day15.SensorIndex([]).covering((14, 11))) == []
+    with pytest.raises(ValueError):
+        day15.SensorIndex(sensors, node_size=1)
+
+
+def test_day15_without_numpy(monkeypatch):
+    sensors = day15.parse(io.StringIO(get_test_data("day15.txt")))
+    vectorized = day15.coverage(sensors, range(-10, 31))
+    monkeypatch.setattr(day15, "np", None)
+    assert day15.coverage(sensors, range(-10, 31), band_size=8) == vectorized
+    assert day15.part_a(sensors, 10) == 26
+    assert day15.part_b(sensors, 20) == 56000011
+
+
+def test_day15_coverage_many_sensors(monkeypatch):
+    rng = random.Random(15)
+    sensors = []
+    for _ in range(2000):
+        x, y = rng.randint(0, 10000), rng.randint(0, 10000)
+        sensors.append(day15.Sensor((x, y), (x + rng.randint(0, 500), y)))
+    monkeypatch.setattr(day15, "BAND_CELLS", 1000)  # bands of one row
+    rows = range(4900, 5100)
+    covered = day15.coverage(sensors, rows)
+    for y in rows:
+        bounds = [b for b in (s.xbound_at(y) for s in sensors) if b]
+        assert covered[y] == day15._merge(bounds)
+
+
+def test_day16():
+    valve_system = day16.parse(io.StringIO(get_test_data("day16.txt")))
+    labels = [v.label for v in valve_system.relevant]
+    assert labels == ["AA", "BB", "CC", "DD", "EE", "HH", "JJ"]
+    assert valve_system.distances[0][labels.index("JJ")] == 2
+    assert valve_system.distances[labels.index("HH")][labels.index("JJ")] == 7
+    assert day16.part_a(valve_system) == 1651
+    assert day16.part_b(valve_system) == 1707